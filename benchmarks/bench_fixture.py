@@ -0,0 +1,214 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from delivery import DeliveryTracker
+from metrics import PhaseMetrics, PHASES
+from selector_registry import SelectorRegistry
+from supervisor import driver_alive
+from transport import WhatsAppWebTransport
+import browser
+import whatsapp_web
+
+# === Fixture benchmark ===
+# Serves fixture/whatsapp_fixture.html - a local stand-in for the parts of
+# WhatsApp Web we touch (chat list, /send?phone= chat, the composer variants
+# from COMPOSER_SELECTORS, the invalid-number popup) with configurable
+# render delays - and drives headless Chrome against it with each send
+# strategy. Reports p50/p95 per-contact latency, contacts/hour and the
+# delivery statuses the tracker resolved from the fixture's animated ticks,
+# so wait and insertion changes can be compared offline on a Linux box.
+#
+#   python benchmarks/bench_fixture.py --contacts 100 --delay-ms 400 --variant mixed
+#
+# Needs Chrome; chromedriver is resolved like in a normal run (or pass
+# --chromedriver).
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixture", "whatsapp_fixture.html")
+
+# Settings overrides per strategy
+STRATEGIES = {
+    "url+paste": {"navigation": "url", "insert_mode": "paste"},
+    "url+type": {"navigation": "url", "insert_mode": "type"},
+    "in_app+paste": {"navigation": "in_app", "insert_mode": "paste"},
+    "in_app+type": {"navigation": "in_app", "insert_mode": "type"},
+    "url+paste, poll 0.1s": {"navigation": "url", "insert_mode": "paste", "poll_interval": 0.1},
+    "url+paste, poll 0.5s": {"navigation": "url", "insert_mode": "paste", "poll_interval": 0.5},
+}
+
+MESSAGE = "Hi there 👋\n\nThis is a *fixture* benchmark message.\nSecond line."
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, config):
+        with open(FIXTURE_PATH, encoding="utf-8") as f:
+            page = f.read()
+        self.page = page.replace("/*FIXTURE_CONFIG*/{}", json.dumps(config)).encode("utf-8")
+        super().__init__(("127.0.0.1", 0), FixtureHandler)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if urlparse(self.path).path not in ("/", "/send"):
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(self.server.page)))
+        self.end_headers()
+        self.wfile.write(self.server.page)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# The transport only needs run(); no restarts in a benchmark
+class DirectSupervisor:
+    restarts = failovers = recycles = 0
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def start(self):
+        return browser.open_whatsapp(self.driver)
+
+    def is_alive(self):
+        return driver_alive(self.driver)
+
+    def run(self, task):
+        return task(self.driver)
+
+    def quit(self):
+        self.driver.quit()
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run_strategy(position, overrides, numbers, workdir, delivery_poll_seconds, delivery_final_wait):
+    saved = {key: settings[key] for key in overrides}
+    settings.update(overrides)
+    metrics = PhaseMetrics()
+    registry = SelectorRegistry(os.path.join(workdir, "selectors.json"),
+                                os.path.join(workdir, f"selector_stats_{position}.json"),
+                                defaults=whatsapp_web.COMPOSER_SELECTORS)
+    driver = browser.start_chrome(browser.build_options(lean=True), lean=False)
+    delivery = DeliveryTracker(whatsapp_web.OUTGOING_BUBBLE_CSS, delivery_poll_seconds)
+    transport = WhatsAppWebTransport(DirectSupervisor(driver), registry, metrics, delivery,
+                                     delivery_final_wait)
+    latencies = []
+    outcomes = {}
+    resolve_seconds = []
+    try:
+        transport.start()
+        started = time.perf_counter()
+        for number in numbers:
+            contact_started = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    status = transport.send(number, MESSAGE)
+            except Exception as error:
+                status = f"error: {type(error).__name__}"
+            latencies.append(time.perf_counter() - contact_started)
+            outcomes[status] = outcomes.get(status, 0) + 1
+            resolve_seconds.extend(seconds for _, _, seconds in transport.delivery_updates())
+        elapsed = time.perf_counter() - started
+        # Outside the timed loop: wait for the ticks still pending
+        resolve_seconds.extend(seconds for _, _, seconds in transport.delivery_updates(final=True))
+    finally:
+        transport.supervisor.quit()
+        settings.update(saved)
+
+    return {
+        "p50": percentile(latencies, 0.5),
+        "p95": percentile(latencies, 0.95),
+        "per_hour": len(numbers) / elapsed * 3600,
+        "outcomes": outcomes,
+        "delivery": dict(delivery.counts),
+        "resolve_p50": percentile(resolve_seconds, 0.5) if resolve_seconds else None,
+        "phases": {phase: metrics.histograms[phase].quantile(0.5)
+                   for phase in PHASES if phase in metrics.histograms},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark send strategies against a local WhatsApp Web fixture")
+    parser.add_argument("--contacts", type=int, default=50, help="contacts per strategy")
+    parser.add_argument("--strategies", nargs="+", default=list(STRATEGIES), choices=list(STRATEGIES))
+    parser.add_argument("--delay-ms", type=int, default=300, help="chat render delay")
+    parser.add_argument("--jitter-ms", type=int, default=100)
+    parser.add_argument("--boot-delay-ms", type=int, default=500, help="app shell boot delay per page load")
+    parser.add_argument("--send-delay-ms", type=int, default=100, help="ENTER to outgoing bubble")
+    parser.add_argument("--tick-delay-ms", type=int, default=500, help="per tick step: pending, sent, delivered")
+    parser.add_argument("--delivery-poll-seconds", type=float, default=2, help="chat list tick poll interval")
+    parser.add_argument("--delivery-final-wait", type=float, default=10,
+                        help="seconds to wait for pending ticks after the last contact")
+    parser.add_argument("--invalid-percent", type=int, default=10)
+    parser.add_argument("--variant", default="mixed",
+                        help="composer variant: index into COMPOSER_SELECTORS or 'mixed'")
+    parser.add_argument("--chromedriver", help="chromedriver binary (skips the driver cache)")
+    args = parser.parse_args()
+
+    numbers = [f"+9198{index:08d}" for index in range(args.contacts)]
+    server = FixtureServer({
+        "delay_ms": args.delay_ms,
+        "jitter_ms": args.jitter_ms,
+        "boot_delay_ms": args.boot_delay_ms,
+        "send_delay_ms": args.send_delay_ms,
+        "tick_delay_ms": args.tick_delay_ms,
+        "invalid_percent": args.invalid_percent,
+        "variant": args.variant if args.variant == "mixed" else int(args.variant),
+        "chats": numbers,
+    })
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings.update({"whatsapp_url": server.url, "lean_mode": True, "headless": True})
+    if args.chromedriver:
+        settings["chromedriver_path"] = args.chromedriver
+    workdir = tempfile.mkdtemp(prefix="bench_fixture_")
+
+    print(f"🧪 Fixture at {server.url}, {args.contacts} contacts per strategy")
+    results = {}
+    for position, name in enumerate(args.strategies):
+        print(f"   running {name}...")
+        results[name] = run_strategy(position, STRATEGIES[name], numbers, workdir,
+                                     args.delivery_poll_seconds, args.delivery_final_wait)
+    server.shutdown()
+
+    print(f"\n{'strategy':24} {'p50 s':>8} {'p95 s':>8} {'contacts/h':>11}  outcomes")
+    for name, result in results.items():
+        outcomes = ", ".join(f"{status}: {count}" for status, count in result["outcomes"].items())
+        print(f"{name:24} {result['p50']:8.2f} {result['p95']:8.2f} {result['per_hour']:11,.0f}  {outcomes}")
+
+    print(f"\n{'delivery':24} {'p50 s':>8}  statuses")
+    for name, result in results.items():
+        statuses = ", ".join(f"{status}: {count}" for status, count in sorted(result["delivery"].items()))
+        resolve = "     n/a" if result["resolve_p50"] is None else f"{result['resolve_p50']:8.2f}"
+        print(f"{name:24} {resolve}  {statuses or 'none resolved'}")
+
+    print(f"\n{'median per phase (s)':24} " + " ".join(f"{phase[:8]:>8}" for phase in PHASES))
+    for name, result in results.items():
+        cells = [result["phases"].get(phase) for phase in PHASES]
+        print(f"{name:24} " + " ".join("     n/a" if cell is None else f"{cell:8.2f}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
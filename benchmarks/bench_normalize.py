@@ -0,0 +1,79 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from phone_numbers import normalize_numbers
+
+# === Normalization benchmark ===
+# Builds a column of messy numbers (the formats we actually get in sheets)
+# and times the vectorized engine against the old row-by-row cleanup.
+#
+#   python benchmarks/bench_normalize.py --rows 1000000
+
+FORMATS = [
+    lambda r: f"+33 6 {r.randint(10, 99)} {r.randint(10, 99)} {r.randint(10, 99)} {r.randint(10, 99)}",
+    lambda r: f"91{r.randint(6000000000, 9999999999)}.0",           # Excel float
+    lambda r: f"{r.randint(6000000000, 9999999999)}",                # national, no country code
+    lambda r: f"0{r.randint(6000000000, 9999999999)}",               # national with trunk zero
+    lambda r: f"+91 {r.randint(60000, 99999)} {r.randint(10000, 99999)}",
+    lambda r: f"9.1{r.randint(100000000, 999999999)}E+11",           # Excel scientific
+    lambda r: f"0044 7{r.randint(100000000, 999999999)}",
+    lambda r: f"+1 ({r.randint(200, 999)}) {r.randint(200, 999)}-{r.randint(1000, 9999)}",
+    lambda r: str(r.randint(100, 99999)),                            # too short
+    lambda r: "",
+]
+
+
+def make_numbers(rows, seed=0):
+    r = random.Random(seed)
+    return pd.Series([r.choice(FORMATS)(r) for _ in range(rows)], dtype=object)
+
+
+# What main.py used to do, for comparison
+def old_fix_number(num):
+    if num.startswith('+1') and len(num) > 12:
+        return num[:12]
+    elif num.startswith('+') and len(num) > 15:
+        return num[:15]
+    return num
+
+
+def old_cleanup(numbers):
+    cleaned = numbers.astype(str).str.replace(r'[^\d+]', '', regex=True)
+    return cleaned.apply(old_fix_number)
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark phone number normalization")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--region", default="IN")
+    args = parser.parse_args()
+
+    print(f"🧪 Generating {args.rows:,} numbers...")
+    numbers = make_numbers(args.rows)
+
+    _, old_seconds = timed(old_cleanup, numbers)
+    result, new_seconds = timed(normalize_numbers, numbers, args.region)
+
+    print(f"old apply(fix_number):  {old_seconds:7.2f} s  {args.rows / old_seconds:12,.0f} rows/s")
+    print(f"normalize_numbers:      {new_seconds:7.2f} s  {args.rows / new_seconds:12,.0f} rows/s")
+    print()
+    print("Reason codes:")
+    for reason, count in result["reason"].value_counts().items():
+        print(f"  {reason:22} {count:>10,}")
+
+
+if __name__ == "__main__":
+    main()
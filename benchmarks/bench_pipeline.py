@@ -0,0 +1,109 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_normalize import make_numbers
+from contacts import iter_contacts, count_rows
+from contact_index import ContactIndex
+from fake_transport import FakeTransport
+from journal import SendJournal
+from metrics import PhaseMetrics, PHASES
+from pacing import PacingScheduler
+from result_sinks import open_sink
+from retries import RetryQueue
+from selector_registry import SelectorRegistry
+from sender import Sender
+from templating import MessageTemplate
+import whatsapp_web
+
+# === Pipeline benchmark ===
+# Runs the whole send pipeline - ingestion, normalization, dedupe, template
+# rendering, pacing, retries, journal, results file, metrics - against the
+# fake transport on synthetic contacts. With --time-scale 0 (the default)
+# the fake adds no latency, so the result is our own per-contact overhead;
+# with --time-scale 1 it plays back realistic browser latencies.
+#
+#   python benchmarks/bench_pipeline.py --contacts 5000
+#   python benchmarks/bench_pipeline.py --contacts 500 --crash-rate 0.01 --drift-every 100
+
+TEMPLATE = "Hi {name|there},\n\nquick question for {company|your team}: *can we talk this week?*"
+NAMES = ["Asha", "Ben", "Chloé", "Dev", "Élodie", "Farid", "", None]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella_Corp", "", None]
+
+
+def write_contacts(path, rows, seed=0):
+    r = random.Random(seed)
+    pd.DataFrame({
+        "phone": make_numbers(rows, seed),
+        "name": [r.choice(NAMES) for _ in range(rows)],
+        "company": [r.choice(COMPANIES) for _ in range(rows)],
+    }).to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the send pipeline against the fake transport")
+    parser.add_argument("--contacts", type=int, default=5000, help="synthetic rows in the contact file")
+    parser.add_argument("--time-scale", type=float, default=0.0,
+                        help="fraction of the simulated browser latency to actually sleep")
+    parser.add_argument("--invalid-rate", type=float, default=0.05)
+    parser.add_argument("--timeout-rate", type=float, default=0.02)
+    parser.add_argument("--crash-rate", type=float, default=0.002)
+    parser.add_argument("--drift-every", type=int, default=0, help="contacts between selector changes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    path = lambda name: os.path.join(workdir, name)
+    write_contacts(path("contacts.csv"), args.contacts, args.seed)
+
+    skipped_rows = {}
+    contact_index = ContactIndex(path("contacts.db"))
+    template = MessageTemplate(TEMPLATE)
+    metrics = PhaseMetrics(path("metrics.prom"), path("spans.jsonl"), export_seconds=5)
+    registry = SelectorRegistry(path("selectors.json"), path("selector_stats.json"),
+                                defaults=whatsapp_web.COMPOSER_SELECTORS)
+    transport = FakeTransport(metrics, invalid_rate=args.invalid_rate, timeout_rate=args.timeout_rate,
+                              crash_rate=args.crash_rate, drift_every=args.drift_every,
+                              selector_registry=registry, time_scale=args.time_scale, seed=args.seed)
+    journal = SendJournal(path("journal.jsonl"), "bench")
+    results_sink = open_sink(path("results.csv"))
+    # No pacing and no backoff: measure the pipeline, not the waits
+    pacer = PacingScheduler(max_per_minute=10**9, burst=10**6)
+    retry_queue = RetryQueue(max_attempts=3, base_delay=0, max_delay=0)
+
+    sender = Sender(transport, pacer, retry_queue, metrics, journal, results_sink,
+                    contact_index=contact_index, total_rows=count_rows(path("contacts.csv")),
+                    skipped_rows=skipped_rows, verbose=False)
+
+    print(f"🧪 {args.contacts:,} synthetic rows in {workdir}")
+    started = time.perf_counter()
+    sender.run(iter_contacts(path("contacts.csv"), 1000, "IN", stats=skipped_rows,
+                             index=contact_index, template=template))
+    for closing in (journal, results_sink, metrics, contact_index):
+        closing.close()
+    elapsed = time.perf_counter() - started
+
+    overhead = elapsed - transport.simulated_seconds * args.time_scale
+    print(f"\nContacts sent through:  {sender.processed:>10,}  ({results_sink.rows_written:,} final results)")
+    print(f"Skipped while reading:  {sum(skipped_rows.values()):>10,}")
+    print(f"Wall time:              {elapsed:>10.2f} s")
+    print(f"Throughput:             {sender.processed / elapsed:>10,.0f} contacts/s")
+    print(f"Pipeline overhead:      {overhead / max(sender.processed, 1) * 1000:>10.3f} ms/contact")
+    print(f"Success / failed:       {sender.success_count:>10,} / {sender.failed_count:,}")
+    print(f"Retries (recovered):    {retry_queue.retried:>10,} ({retry_queue.recovered:,})")
+    print(f"Simulated restarts:     {transport.restarts:>10,}")
+    print("\nMeasured phase medians (includes the scaled simulated latency):")
+    for phase in PHASES:
+        if phase in metrics.histograms:
+            print(f"  {phase:18} {metrics.histograms[phase].quantile(0.5) * 1000:10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
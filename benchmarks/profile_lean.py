@@ -0,0 +1,103 @@
+import argparse
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from contacts import iter_contacts
+import browser
+import whatsapp_web
+
+# === Lean mode profile ===
+# Opens the same chats (without sending anything) once with the normal
+# browser and once in lean mode, and reports what each contact costs:
+# CPU seconds and bytes downloaded per contact, peak RSS of the whole Chrome
+# process tree and the page's JS heap. Uses the saved profile, so log in
+# with the normal mode first.
+#
+#   python benchmarks/profile_lean.py --contacts 20
+#
+# CPU and RSS need psutil; without it only heap and transfer are shown.
+
+
+def profile_mode(lean, numbers):
+    driver = browser.start_chrome(browser.build_options(settings["profile_dir"], lean=lean), lean=lean)
+    try:
+        browser.open_whatsapp(driver)
+        before = browser.resource_usage(driver)
+        peak_rss = before["rss_mb"]
+        transfer = 0.0
+        last = before
+        # Resource buffers fill up on a page that never reloads (in-app navigation)
+        driver.execute_script("performance.setResourceTimingBufferSize(100000);")
+        started = time.time()
+        for number in numbers:
+            whatsapp_web.open_chat(driver, number)
+            whatsapp_web.wait_for_page_state(driver)
+            usage = browser.resource_usage(driver)
+            if usage["rss_mb"] is not None:
+                peak_rss = max(peak_rss, usage["rss_mb"])
+            # The transfer count is per document: add what this contact added,
+            # or all of it when /send?phone= reloaded the page
+            if usage["page_id"] is not None and usage["page_id"] == last["page_id"]:
+                transfer += (usage["transfer_kb"] or 0.0) - (last["transfer_kb"] or 0.0)
+            else:
+                transfer += usage["transfer_kb"] or 0.0
+            last = usage
+        elapsed = time.time() - started
+        after = browser.resource_usage(driver)
+    finally:
+        driver.quit()
+
+    cpu = None
+    if after["cpu_seconds"] is not None and before["cpu_seconds"] is not None:
+        cpu = (after["cpu_seconds"] - before["cpu_seconds"]) / len(numbers)
+    return {
+        "seconds": elapsed / len(numbers),
+        "cpu_seconds": cpu,
+        "peak_rss_mb": peak_rss,
+        "js_heap_mb": after["js_heap_mb"],
+        "transfer_kb": transfer / len(numbers),
+    }
+
+
+def _format(value, unit):
+    return "n/a" if value is None else f"{value:.2f} {unit}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-contact browser cost of normal and lean mode")
+    parser.add_argument("--contacts", type=int, default=20, help="chats to open per mode")
+    parser.add_argument("--input", default=settings["input_file"])
+    args = parser.parse_args()
+
+    contacts = iter_contacts(args.input, settings["chunk_size"], settings["default_region"])
+    numbers = [row["number"] for row in itertools.islice(contacts, args.contacts)]
+    if not numbers:
+        print(f"❌ No valid phone numbers found in '{args.input}'")
+        return
+
+    print(f"🧪 Opening {len(numbers)} chats per mode (nothing is sent)...")
+    results = {}
+    for name, lean in (("normal", False), ("lean", True)):
+        results[name] = profile_mode(lean, numbers)
+
+    rows = [
+        ("time / contact", "seconds", "s"),
+        ("CPU / contact", "cpu_seconds", "s"),
+        ("transfer / contact", "transfer_kb", "KB"),
+        ("peak RSS", "peak_rss_mb", "MB"),
+        ("JS heap", "js_heap_mb", "MB"),
+    ]
+    print(f"\n{'':20} {'normal':>14} {'lean':>14} {'saved':>8}")
+    for label, key, unit in rows:
+        normal, lean = results["normal"][key], results["lean"][key]
+        saved = f"{(1 - lean / normal) * 100:7.0f}%" if normal and lean is not None else "     n/a"
+        print(f"{label:20} {_format(normal, unit):>14} {_format(lean, unit):>14} {saved}")
+
+
+if __name__ == "__main__":
+    main()
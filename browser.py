@@ -0,0 +1,162 @@
+import os
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+from config import settings
+from driver_resolver import resolve_chromedriver, installed_chrome_version
+import whatsapp_web
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# === Chrome setup ===
+# With a profile directory, Chrome keeps the WhatsApp Web session (local
+# storage + IndexedDB) between runs, so a warm start skips the QR scan and
+# only waits for the app to boot.
+#
+# Lean mode trims what Chrome does per chat: headless, a fixed small window,
+# no images, avatars and media previews (content setting + blocked media
+# hosts), and a capped JS heap. Sending text doesn't need any of those.
+
+# WhatsApp Web refuses "HeadlessChrome" user agents
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/{version} Safari/537.36")
+
+
+def build_options(profile_dir=None, lean=None):
+    lean = settings["lean_mode"] if lean is None else lean
+    chrome_options = Options()
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])
+
+    if lean:
+        if settings["headless"]:
+            chrome_options.add_argument("--headless=new")
+            version = installed_chrome_version() or "130.0.0.0"
+            chrome_options.add_argument(f"--user-agent={USER_AGENT.format(version=version)}")
+        chrome_options.add_argument(f"--window-size={settings['window_size']}")
+        chrome_options.add_argument(f"--js-flags=--max-old-space-size={settings['js_heap_mb']}")
+        chrome_options.add_argument("--renderer-process-limit=2")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-background-networking")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+        })
+    else:
+        chrome_options.add_argument("--start-maximized")
+
+    if profile_dir:
+        chrome_options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+        chrome_options.add_argument("--profile-directory=Default")
+    return chrome_options
+
+
+def start_chrome(chrome_options, lean=None):
+    lean = settings["lean_mode"] if lean is None else lean
+    driver_path = resolve_chromedriver(settings["driver_cache_dir"], settings["chromedriver_path"])
+    driver = webdriver.Chrome(
+        service=Service(driver_path),
+        options=chrome_options
+    )
+    if lean:
+        block_media(driver)
+    return driver
+
+
+# Avatars and media previews are fetched from separate hosts. CDP commands
+# apply to the current tab only, so a new tab needs this again.
+def block_media(driver):
+    if settings["blocked_urls"]:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": settings["blocked_urls"]})
+
+
+# Opens WhatsApp Web and waits until it is usable. Returns "session" when the
+# saved login was reused or "qr" when a scan was needed.
+def open_whatsapp(driver, timeout=None):
+    driver.get(settings["whatsapp_url"])
+    # A headless browser can't show the QR code, so it goes to a file
+    qr_screenshot = settings["qr_screenshot"] if settings["lean_mode"] and settings["headless"] else None
+    return whatsapp_web.wait_for_app(driver, timeout, qr_screenshot=qr_screenshot)
+
+
+# Swaps the WhatsApp tab for a fresh one in the same browser: the old tab is
+# closed first (WhatsApp Web only runs in one tab at a time), which frees its
+# renderer with the accumulated heap and DOM. The login lives in the profile,
+# so the new tab comes up without a QR scan.
+def recycle_tab(driver, timeout=None):
+    old_tab = driver.current_window_handle
+    driver.switch_to.new_window("tab")
+    new_tab = driver.current_window_handle
+    driver.switch_to.window(old_tab)
+    driver.close()
+    driver.switch_to.window(new_tab)
+    if settings["lean_mode"]:
+        block_media(driver)
+    return open_whatsapp(driver, timeout)
+
+
+# JS heap and DOM size of the current tab
+def page_metrics(driver):
+    driver.execute_cdp_cmd("Performance.enable", {})
+    metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    values = {m["name"]: m["value"] for m in metrics}
+    heap = values.get("JSHeapUsedSize")
+    return {
+        "js_heap_mb": heap / 2**20 if heap is not None else None,
+        "dom_nodes": values.get("Nodes"),
+    }
+
+
+# === Resource usage ===
+# CPU and memory of chromedriver + every Chrome process under it (needs
+# psutil), plus the page's JS heap and bytes downloaded so far.
+def resource_usage(driver):
+    usage = {"cpu_seconds": None, "rss_mb": None, "js_heap_mb": None, "dom_nodes": None,
+             "transfer_kb": None, "page_id": None}
+
+    process = getattr(driver.service, "process", None)
+    if psutil is not None and process is not None:
+        try:
+            root = psutil.Process(process.pid)
+            cpu = rss = 0.0
+            for proc in [root] + root.children(recursive=True):
+                try:
+                    times = proc.cpu_times()
+                    cpu += times.user + times.system
+                    rss += proc.memory_info().rss
+                except psutil.Error:
+                    continue
+            usage["cpu_seconds"] = cpu
+            usage["rss_mb"] = rss / 2**20
+        except psutil.Error:
+            pass
+
+    try:
+        usage.update(page_metrics(driver))
+    except Exception:
+        pass
+
+    # Cumulative for the current document; page_id (its time origin) changes
+    # when the page reloads and the count starts over
+    try:
+        transferred, usage["page_id"] = driver.execute_script(
+            "return [performance.getEntriesByType('resource')"
+            ".reduce(function (total, e) { return total + (e.transferSize || 0); }, 0),"
+            " performance.timeOrigin];"
+        )
+        usage["transfer_kb"] = transferred / 1024
+    except Exception:
+        pass
+
+    usage["ts"] = time.time()
+    return usage
@@ -0,0 +1,125 @@
+import argparse
+import json
+import os
+import sys
+
+from config import settings
+
+# === Command line ===
+#   python cli.py send [--input FILE] [--output FILE] [--template FILE] [--resume] ...
+#   python cli.py dry-run [--input FILE] [--sample 3]
+#   python cli.py import-suppression FILE [--reason opt_out]
+#
+# --config FILE (JSON, or TOML on Python 3.11+) overrides any key of
+# config.py, e.g. {"max_per_minute": 4, "send_window": ["09:00", "19:00"]}.
+# It goes before or after the command (`python main.py --config x.json`
+# works too).
+# Each command imports what it needs when it runs, so `dry-run` never loads
+# selenium or starts Chrome.
+
+
+def load_config(path):
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            raise SystemExit("❌ TOML config files need Python 3.11+ (or use a .json file)")
+        with open(path, "rb") as f:
+            overrides = tomllib.load(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            overrides = json.load(f)
+
+    unknown = sorted(set(overrides) - set(settings))
+    if unknown:
+        raise SystemExit(f"❌ Unknown setting(s) in '{path}': {', '.join(unknown)}")
+    settings.update(overrides)
+
+
+def apply_overrides(args):
+    for option, key in (("input", "input_file"), ("output", "output_file"),
+                        ("template", "template_file"), ("campaign", "campaign"),
+                        ("region", "default_region")):
+        value = getattr(args, option, None)
+        if value is not None:
+            settings[key] = value
+    if getattr(args, "lean", False):
+        settings["lean_mode"] = True
+
+
+def cmd_send(args):
+    import main
+
+    return main.run(args)
+
+
+def cmd_dry_run(args):
+    from dry_run import run
+
+    return run(args)
+
+
+def cmd_import_suppression(args):
+    from contact_index import ContactIndex, import_suppression_file
+
+    index = ContactIndex(settings["index_file"], settings["campaign"])
+    added = import_suppression_file(index, args.file, settings["default_region"], args.reason)
+    index.close()
+    print(f"🚫 Added {added} numbers to the suppression list in '{settings['index_file']}'")
+    return 0
+
+
+def build_parser():
+    config_help = "JSON/TOML file overriding config.py settings"
+    parser = argparse.ArgumentParser(description="Bulk WhatsApp Web sender")
+    parser.add_argument("--config", help=config_help)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # Shared by every command; SUPPRESS keeps a --config given before the
+    # command from being reset by the subcommand's default
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--config", default=argparse.SUPPRESS, help=config_help)
+
+    def add_input_options(command):
+        command.add_argument("--input", help="contact file (.xlsx, .csv or .parquet)")
+        command.add_argument("--template", help="message template file")
+        command.add_argument("--campaign", help="campaign name for the contact index and journal")
+        command.add_argument("--region", help="default country for numbers without a country code")
+
+    send = commands.add_parser("send", parents=[common], help="send the message to every contact")
+    add_input_options(send)
+    send.add_argument("--output", help="results file (.xlsx, .csv, .jsonl or .parquet)")
+    send.add_argument("--resume", action="store_true",
+                      help="skip contacts already completed for this campaign in the send journal")
+    send.add_argument("--recheck-invalid", action="store_true",
+                      help="send to numbers cached as invalid instead of skipping them")
+    send.add_argument("--lean", action="store_true", help="run Chrome in lean mode")
+    send.set_defaults(handler=cmd_send)
+
+    dry_run = commands.add_parser("dry-run", parents=[common], help="ingest, normalize, dedupe and render without a browser")
+    add_input_options(dry_run)
+    dry_run.add_argument("--no-index", action="store_true",
+                         help="don't check the contact index (suppressed / sent / cached invalid)")
+    dry_run.add_argument("--sample", type=int, default=0, help="print the first N rendered messages")
+    dry_run.set_defaults(handler=cmd_dry_run)
+
+    suppress = commands.add_parser("import-suppression", parents=[common],
+                                      help="import a do-not-contact list")
+    suppress.add_argument("file", help="xlsx, csv or parquet file with a phone number column")
+    suppress.add_argument("--reason", default="opt_out")
+    suppress.set_defaults(handler=cmd_import_suppression)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.config:
+        if not os.path.exists(args.config):
+            raise SystemExit(f"❌ Config file '{args.config}' not found")
+        load_config(args.config)
+    apply_overrides(args)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+# === Settings ===
+# Timeouts are upper bounds for the readiness waits in whatsapp_web.py - the
+# waits return as soon as the page is actually ready, so a fast page costs
+# milliseconds, not the full timeout.
+# Pacing is separate: the scheduler in pacing.py decides when each send may
+# happen (rate, caps, send window) and waits exactly until then.
+# Any of these can be overridden per run with `python cli.py --config FILE`
+# (JSON or TOML with the same keys) or the command line options in cli.py.
+settings = {
+    # Contacts (.xlsx, .csv or .parquet), read in chunks
+    "input_file": "RAW_data.xlsx",
+    "chunk_size": 1000,
+    "default_region": "IN",    # country for numbers written without a country code
+
+    # Message template: {column} or {column|default} placeholders are filled
+    # from the contact file; values are escaped unless template_escape is off
+    "template_file": "message_template.txt",
+    "template_escape": True,
+
+    # Contact index (SQLite): suppression list + numbers already messaged.
+    # Numbers sent under the same campaign name are skipped on re-runs.
+    # Import a do-not-contact list with: python cli.py import-suppression opt_out.csv
+    "index_file": "contacts.db",
+    "campaign": "default",
+    # Numbers found invalid / not on WhatsApp are skipped for this many days
+    # (None = forever); run with --recheck-invalid to try them anyway
+    "invalid_ttl_days": 30,
+
+    # Append-only log of every outcome (used by --resume)
+    "journal_file": "send_journal.jsonl",
+
+    # Results file (.csv, .jsonl, .xlsx or .parquet). CSV and JSONL are
+    # readable while the run goes; xlsx and Parquet only once it has ended
+    "output_file": "message_results.csv",
+    "flush_every": 50,         # rows
+    "flush_seconds": 10,
+
+    # Chrome profile that keeps the WhatsApp Web login between runs
+    # (None = fresh profile and a QR scan every run)
+    "profile_dir": "chrome_profile",
+
+    # Hot standby: keep a second Chrome (on a copy of the profile) started
+    # but parked on about:blank, so a restart only has to load WhatsApp Web
+    # instead of launching Chrome too
+    "hot_standby": False,
+    "standby_profile_dir": "chrome_profile_standby",
+
+    # Lean mode: headless, small window, no images/avatars/media previews and
+    # a capped JS heap. Log in once with lean_mode off (or scan the QR
+    # screenshot) - the saved profile is reused afterwards.
+    "lean_mode": False,
+    "headless": True,
+    "window_size": "1280,800",
+    "js_heap_mb": 512,
+    "blocked_urls": ["*pps.whatsapp.net*", "*mmg.whatsapp.net*", "*media*.whatsapp.net*"],
+    "qr_screenshot": "whatsapp_qr.png",
+
+    # Memory recycling: every memory_check_every contacts the tab's JS heap
+    # and DOM size are sampled; past a limit the "tab" (or the whole Chrome
+    # "session") is recycled. 0 / None turns the check or a limit off.
+    "memory_check_every": 25,
+    "max_js_heap_mb": 350,
+    "max_dom_nodes": 120000,
+    "recycle_mode": "tab",
+
+    # chromedriver: cached per Chrome major version in driver_cache_dir;
+    # set chromedriver_path to pin a specific binary instead
+    "driver_cache_dir": "drivers",
+    "chromedriver_path": None,
+
+    # Where WhatsApp Web lives (the fixture benchmark points this at localhost)
+    "whatsapp_url": "https://web.whatsapp.com",
+
+    # Readiness timeouts (seconds)
+    "login_timeout": 120,      # QR scan / app boot at startup or after a restart
+    "page_timeout": 20,        # chat pane (or invalid-number alert) after opening a chat
+    "composer_timeout": 10,    # message box located and focused
+    "confirm_timeout": 10,     # outgoing bubble appended after ENTER
+    "poll_interval": 0.25,     # how often the waits re-check the page
+
+    # Chat navigation: "url" always reloads via the /send?phone= URL; "in_app"
+    # reuses the loaded app for numbers that already have a chat and falls
+    # back to the URL for new ones (only worth it for mostly known numbers)
+    "navigation": "url",
+    "in_app_timeout": 3,       # search result + chat header, before falling back
+
+    # Message insertion: "paste" inserts the whole message in one go and falls
+    # back to typing if the composer doesn't match; "type" types line by line
+    "insert_mode": "paste",
+    "paste_verify_timeout": 2,
+
+    # Pacing: token bucket of max_per_minute sends (up to pacing_burst back to
+    # back), capped per rolling hour and per calendar day (None = no cap).
+    # send_window ("HH:MM", "HH:MM") limits sending to those hours, in the
+    # recipient's time zone when the contact file has a timezone_column
+    # (IANA name like "Asia/Kolkata" or an offset like "+05:30"), otherwise
+    # in send_timezone (None = this machine's time). None = any time.
+    "max_per_minute": 6,
+    "pacing_burst": 1,
+    "hourly_cap": 300,
+    "daily_cap": 2000,
+    "send_window": None,       # e.g. ("09:00", "20:00")
+    "send_timezone": None,
+    "timezone_column": "timezone",
+    "projection_every": 50,    # contacts between completion-time estimates
+
+    # Phase timings: spans_file gets one JSON line per phase per contact,
+    # metrics_file (.prom for the Prometheus textfile collector, or .json)
+    # is rewritten every metrics_export_seconds. None turns either off.
+    "spans_file": "spans.jsonl",
+    "metrics_file": "metrics.prom",
+    "metrics_export_seconds": 30,
+    "metrics_window": 500,     # contacts behind the recent p50/p95
+
+    # Delivery confirmation: message ticks are checked in the background
+    # (chat list, at most every delivery_poll_seconds); a message resolves
+    # when delivered or after delivery_timeout seconds with the status it
+    # reached. At the end the run waits up to delivery_final_wait seconds.
+    "delivery_tracking": True,
+    "delivery_poll_seconds": 15,
+    "delivery_timeout": 600,
+    "delivery_final_wait": 30,
+
+    # Retries: transient failures (timeouts, stale elements, browser crashes)
+    # get up to retry_attempts tries in total, the n-th retry after
+    # retry_base_delay * retry_backoff**(n-1) seconds (at most retry_max_delay)
+    "retry_attempts": 3,
+    "retry_base_delay": 60,
+    "retry_max_delay": 900,
+    "retry_backoff": 2,
+
+    # Message box selectors (see selector_registry.py)
+    "selectors_file": "composer_selectors.json",
+    "selector_stats_file": "selector_stats.json",
+    "selector_demote_after": 5,  # consecutive misses before a selector is tried last
+}
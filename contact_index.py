@@ -0,0 +1,136 @@
+import sqlite3
+import time
+
+# === Contact index ===
+# SQLite file with primary-key tables that are checked during ingestion,
+# before a contact ever reaches the browser:
+#   suppressed - do-not-contact list (bulk imported, never messaged)
+#   sent       - numbers already messaged, per campaign (re-runs skip them)
+#   invalid    - numbers WhatsApp reported as invalid / not on WhatsApp,
+#                with when that was seen; skipped until the entry is older
+#                than invalid_ttl seconds (None = never expires)
+# Lookups are batched per chunk, one indexed query per ~500 numbers.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS suppressed (
+    number   TEXT PRIMARY KEY,
+    reason   TEXT,
+    added_at TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sent (
+    campaign TEXT,
+    number   TEXT,
+    sent_at  TEXT,
+    PRIMARY KEY (campaign, number)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS invalid (
+    number     TEXT PRIMARY KEY,
+    checked_at REAL
+) WITHOUT ROWID;
+"""
+
+SUPPRESSED = "suppressed"
+ALREADY_SENT = "already_sent"
+DUPLICATE = "duplicate"
+CACHED_INVALID = "cached_invalid"
+
+BATCH_SIZE = 500  # stays well under SQLite's bound-variable limit
+
+
+def _now():
+    return time.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _batches(items, size=BATCH_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class ContactIndex:
+    # skip_invalid=False still records verdicts but lets cached invalid
+    # numbers through (to re-check them)
+    def __init__(self, path, campaign="default", invalid_ttl=None, skip_invalid=True):
+        self.path = path
+        self.campaign = campaign
+        self.invalid_ttl = invalid_ttl
+        self.skip_invalid = skip_invalid
+        self.invalid_lookups = 0
+        self.invalid_hits = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def _matching(self, table, numbers, extra_where="", extra_args=()):
+        found = set()
+        for batch in _batches(numbers):
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(
+                f"SELECT number FROM {table} WHERE number IN ({placeholders}){extra_where}",
+                list(batch) + list(extra_args),
+            )
+            found.update(number for (number,) in rows)
+        return found
+
+    # number -> SUPPRESSED / ALREADY_SENT / CACHED_INVALID for every number
+    # the index knows
+    def known(self, numbers):
+        numbers = set(numbers)
+        result = {}
+        if self.skip_invalid:
+            self.invalid_lookups += len(numbers)
+            if self.invalid_ttl is None:
+                invalid = self._matching("invalid", numbers)
+            else:
+                invalid = self._matching("invalid", numbers, " AND checked_at >= ?",
+                                         (time.time() - self.invalid_ttl,))
+            self.invalid_hits += len(invalid)
+            result.update(dict.fromkeys(invalid, CACHED_INVALID))
+        result.update(dict.fromkeys(
+            self._matching("sent", numbers, " AND campaign = ?", (self.campaign,)), ALREADY_SENT
+        ))
+        result.update(dict.fromkeys(self._matching("suppressed", numbers), SUPPRESSED))
+        return result
+
+    def suppress(self, numbers, reason="opt_out"):
+        added_at = _now()
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO suppressed (number, reason, added_at) VALUES (?, ?, ?)",
+                ((number, reason, added_at) for number in numbers),
+            )
+        return self.conn.total_changes - before
+
+    def mark_sent(self, number):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO sent (campaign, number, sent_at) VALUES (?, ?, ?)",
+                (self.campaign, number, _now()),
+            )
+            self.conn.execute("DELETE FROM invalid WHERE number = ?", (number,))
+
+    def mark_invalid(self, number):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO invalid (number, checked_at) VALUES (?, ?)",
+                (number, time.time()),
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+# Bulk-load a do-not-contact list (any file iter_contacts can read)
+def import_suppression_file(index, path, default_region="IN", reason="opt_out", chunk_size=5000):
+    from contacts import iter_chunks, find_number_column, clean_chunk
+
+    added = 0
+    number_column = None
+    for chunk in iter_chunks(path, chunk_size):
+        if number_column is None:
+            number_column = find_number_column(list(chunk.columns.astype(str).str.strip().str.lower()))
+        numbers = clean_chunk(chunk, number_column, default_region)['number']
+        added += index.suppress(numbers.unique(), reason)
+    return added
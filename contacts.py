@@ -0,0 +1,178 @@
+import csv
+import os
+
+import pandas as pd
+
+from phone_numbers import normalize_numbers, VALID_REASONS
+from contact_index import DUPLICATE
+
+RESUMED = "done_before_resume"
+
+# === Contact ingestion ===
+# Rows are read lazily in chunks (xlsx in read-only mode, CSV, Parquet),
+# cleaned one chunk at a time and handed to the sender as a generator, so the
+# first message can go out while the rest of the file is still being read.
+
+POSSIBLE_NUMBER_COLUMNS = ['phone', 'contact', 'mobile', 'telephone', 'phonenumber', 'phone number']
+
+
+def _read_xlsx(path, chunk_size):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(col) if col is not None else "" for col in header]
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk, columns=columns, dtype=object)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=columns, dtype=object)
+    finally:
+        workbook.close()
+
+
+def _read_csv(path, chunk_size):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        sample = f.read(4096)
+    try:
+        delimiter = csv.Sniffer().sniff(sample, delimiters=",;\t").delimiter
+    except csv.Error:
+        delimiter = ","
+    yield from pd.read_csv(path, sep=delimiter, dtype=str, chunksize=chunk_size,
+                           encoding="utf-8-sig", keep_default_na=False)
+
+
+def _read_parquet(path, chunk_size):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet files needs pyarrow (pip install pyarrow)")
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size):
+        yield batch.to_pandas()
+
+
+READERS = {
+    ".xlsx": _read_xlsx,
+    ".xlsm": _read_xlsx,
+    ".csv": _read_csv,
+    ".txt": _read_csv,
+    ".parquet": _read_parquet,
+}
+
+
+def iter_chunks(path, chunk_size=1000):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in READERS:
+        raise ValueError(f"Unsupported contact file type '{ext}' (use .xlsx, .csv or .parquet)")
+    return READERS[ext](path, chunk_size)
+
+
+# Data rows in the file without reading it (xlsx: the sheet's stored
+# dimensions, csv: line count, parquet: footer metadata) - an upper bound on
+# the contacts left after cleaning, for progress estimates
+def count_rows(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".xlsx", ".xlsm"):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True)
+        try:
+            return max((workbook.active.max_row or 1) - 1, 0)
+        finally:
+            workbook.close()
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(path).metadata.num_rows
+    with open(path, "rb") as f:
+        return max(sum(1 for _ in f) - 1, 0)
+
+
+# Same lookup the script always did: exact 'number', then anything that looks
+# like a phone column, then the first column.
+def find_number_column(columns):
+    if 'number' in columns:
+        return 'number'
+
+    for col in columns:
+        if col in POSSIBLE_NUMBER_COLUMNS or 'phone' in col or 'number' in col or 'contact' in col:
+            print(f"⚠️  'number' column not found. Using '{col}' instead.")
+            print()
+            return col
+
+    print(f"⚠️  No phone number column found. Using first column: '{columns[0]}'")
+    print()
+    return columns[0]
+
+
+# Normalizes the number column to E.164 and drops rows that can't be sent
+# to; `stats` (if given) counts the dropped rows per reason code.
+def clean_chunk(chunk, number_column, default_region="IN", stats=None):
+    chunk.columns = chunk.columns.astype(str).str.strip().str.lower()
+    normalized = normalize_numbers(chunk[number_column], default_region)
+    chunk['number'] = normalized['number']
+
+    usable = normalized['reason'].isin(VALID_REASONS)
+    if stats is not None:
+        for reason, count in normalized.loc[~usable, 'reason'].value_counts().items():
+            stats[reason] = stats.get(reason, 0) + int(count)
+    return chunk[usable]
+
+
+# Membership in a growing Python set, per row of the chunk (Series.isin
+# copies the whole set on every call, which gets quadratic over a long file)
+def _in_set(numbers, values):
+    return pd.Series([number in values for number in numbers.tolist()], index=numbers.index, dtype=bool)
+
+
+# Drops numbers already seen in this run or completed in a resumed run, then
+# anything the contact index knows (suppressed / already sent), counting
+# each in `stats`
+def drop_known(chunk, seen, index=None, stats=None, done=()):
+    numbers = chunk['number']
+    reasons = pd.Series("", index=chunk.index, dtype=object)
+    reasons[numbers.duplicated() | _in_set(numbers, seen)] = DUPLICATE
+    if done:
+        reasons[(reasons == "") & _in_set(numbers, done)] = RESUMED
+
+    if index is not None:
+        fresh = numbers[reasons == ""]
+        known = index.known(fresh.unique())
+        if known:
+            reasons[fresh.index] = fresh.map(known).fillna("")
+
+    seen.update(numbers.unique())
+    if stats is not None:
+        for reason, count in reasons[reasons != ""].value_counts().items():
+            stats[reason] = stats.get(reason, 0) + int(count)
+    return chunk[reasons == ""]
+
+
+# Yields one dict per usable contact ('number' plus every other column).
+# With a MessageTemplate, each chunk also gets its rendered 'message' column.
+def iter_contacts(path, chunk_size=1000, default_region="IN", stats=None, index=None, done=(),
+                  template=None):
+    number_column = None
+    seen = set()
+    for chunk in iter_chunks(path, chunk_size):
+        if number_column is None:
+            print("📋 Available columns in file:")
+            print(chunk.columns.tolist())
+            print()
+            number_column = find_number_column(list(chunk.columns.astype(str).str.strip().str.lower()))
+
+        chunk = clean_chunk(chunk, number_column, default_region, stats)
+        chunk = drop_known(chunk, seen, index, stats, done)
+        if template is not None:
+            template.check_columns(chunk.columns)
+            chunk = chunk.assign(message=template.render_chunk(chunk))
+        yield from chunk.to_dict("records")
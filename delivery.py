@@ -0,0 +1,129 @@
+import re
+import time
+
+# === Delivery confirmation ===
+# A bubble in the chat only means WhatsApp Web accepted the message; its
+# ticks say what happened next (clock = pending, one tick = sent to the
+# server, two ticks = delivered to the phone, blue = read). Waiting for that
+# per contact would cost seconds each, so the tracker reads the ticks once
+# right after sending and leaves unresolved messages pending. Between
+# contacts it checks them all with a single script over the chat list (each
+# row shows the tick of its last message), at most every poll_seconds.
+# A message resolves when it is delivered/read, or after `timeout` seconds
+# with whatever it reached by then.
+
+PENDING = "pending"
+SENT = "sent"
+DELIVERED = "delivered"
+READ = "read"
+UNCONFIRMED = "unconfirmed"   # never saw a tick at all
+
+FINAL = (DELIVERED, READ)
+RANK = {None: 0, PENDING: 1, SENT: 2, DELIVERED: 3, READ: 4}
+
+TICK_STATUS_JS = """
+function tickStatus(root) {
+    var icons = root.querySelectorAll('[data-icon]');
+    for (var i = icons.length - 1; i >= 0; i--) {
+        var name = icons[i].getAttribute('data-icon') || '';
+        var label = (icons[i].getAttribute('aria-label') || '').trim().toLowerCase();
+        if (label === 'read' || name.indexOf('ack') >= 0) { return 'read'; }
+        if (name.indexOf('dblcheck') >= 0) { return 'delivered'; }
+        if (name.indexOf('check') >= 0) { return 'sent'; }
+        if (name.indexOf('time') >= 0 || name.indexOf('clock') >= 0) { return 'pending'; }
+    }
+    return null;
+}
+"""
+
+LAST_BUBBLE_STATUS_JS = TICK_STATUS_JS + """
+var bubbles = document.querySelectorAll(arguments[0]);
+return bubbles.length ? tickStatus(bubbles[bubbles.length - 1]) : null;
+"""
+
+CHAT_LIST_STATUS_JS = TICK_STATUS_JS + """
+var wanted = arguments[0], result = {};
+var rows = document.querySelectorAll('#pane-side [role="listitem"], #pane-side [role="row"]');
+for (var i = 0; i < rows.length; i++) {
+    var title = rows[i].querySelector('span[title]');
+    if (!title) { continue; }
+    var digits = title.getAttribute('title').replace(/\\D/g, '');
+    if (wanted.indexOf(digits) >= 0) {
+        result[digits] = tickStatus(rows[i]);
+    }
+}
+return result;
+"""
+
+
+def _digits(number):
+    return re.sub(r"\D", "", number)
+
+
+class DeliveryTracker:
+    def __init__(self, bubble_css, poll_seconds=15, timeout=600):
+        self.bubble_css = bubble_css
+        self.poll_seconds = poll_seconds
+        self.timeout = timeout
+        self.pending = {}     # digits -> [number, sent at, best status so far]
+        self.resolved = []    # (number, status, seconds to resolve) not yet collected
+        self.counts = {}
+        self._polled = 0.0
+
+    def _resolve(self, digits, status=None):
+        number, sent_at, best = self.pending.pop(digits)
+        status = status or best or UNCONFIRMED
+        self.resolved.append((number, status, time.time() - sent_at))
+        self.counts[status] = self.counts.get(status, 0) + 1
+
+    def _update(self, digits, status):
+        entry = self.pending.get(digits)
+        if entry is None or RANK.get(status, 0) <= RANK.get(entry[2], 0):
+            return
+        entry[2] = status
+        if status in FINAL:
+            self._resolve(digits)
+
+    # Right after the bubble appeared, while its chat is still open
+    def track(self, driver, number):
+        digits = _digits(number)
+        self.pending[digits] = [number, time.time(), None]
+        try:
+            self._update(digits, driver.execute_script(LAST_BUBBLE_STATUS_JS, self.bubble_css))
+        except Exception:
+            pass  # stays pending; the chat list poll will pick it up
+
+    # One round trip for every pending message; skipped until poll_seconds
+    # have passed since the last one unless forced
+    def poll(self, driver, force=False):
+        if not self.pending or (not force and time.time() - self._polled < self.poll_seconds):
+            return
+        self._polled = time.time()
+        try:
+            statuses = driver.execute_script(CHAT_LIST_STATUS_JS, list(self.pending))
+        except Exception:
+            statuses = {}
+        for digits, status in (statuses or {}).items():
+            self._update(digits, status)
+
+        expired = [digits for digits, (_, sent_at, _) in self.pending.items()
+                   if time.time() - sent_at >= self.timeout]
+        for digits in expired:
+            self._resolve(digits)
+
+    # End of the run: keep polling for up to `wait` seconds, then resolve
+    # whatever is left with the status it reached
+    def finish(self, driver, wait=0):
+        deadline = time.time() + wait
+        while self.pending and driver is not None:
+            self.poll(driver, force=True)
+            if not self.pending or time.time() >= deadline:
+                break
+            time.sleep(min(2.0, max(0.0, deadline - time.time())))
+        for digits in list(self.pending):
+            self._resolve(digits)
+
+    # Resolved messages since the last call
+    def drain(self):
+        resolved, self.resolved = self.resolved, []
+        return resolved
@@ -0,0 +1,87 @@
+import json
+import os
+import shutil
+import time
+
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+
+# === chromedriver resolution ===
+# The driver binary is copied into a local cache folder and pinned to the
+# installed Chrome's major version in a small manifest. As long as Chrome
+# keeps the same major version, resolving the driver is a file check with no
+# network I/O; only a Chrome upgrade (or an empty cache) goes to
+# webdriver_manager. A fixed `chromedriver_path` skips resolution entirely.
+
+MANIFEST = "manifest.json"
+
+_resolved = None  # resolved once per process (crash restarts reuse it)
+
+
+def installed_chrome_version():
+    try:
+        return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+    except Exception:
+        return None
+
+
+def _major(version):
+    return version.split(".")[0] if version else None
+
+
+def _load_manifest(cache_dir):
+    path = os.path.join(cache_dir, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(cache_dir, manifest):
+    path = os.path.join(cache_dir, MANIFEST)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+# Returns (driver path, where it came from)
+def _resolve(cache_dir, pinned_path):
+    if pinned_path:
+        return pinned_path, "pinned"
+
+    chrome_version = installed_chrome_version()
+    major = _major(chrome_version)
+    manifest = _load_manifest(cache_dir)
+    entry = manifest.get(major) if major else None
+    if entry and os.path.exists(entry["path"]):
+        return entry["path"], "cache"
+
+    # Unknown Chrome version or cache miss: fall back to the network lookup
+    downloaded = ChromeDriverManager().install()
+    if not major:
+        return downloaded, "download"
+
+    target_dir = os.path.join(cache_dir, major)
+    os.makedirs(target_dir, exist_ok=True)
+    target = os.path.join(target_dir, os.path.basename(downloaded))
+    shutil.copy2(downloaded, target)
+    manifest[major] = {"path": target, "chrome_version": chrome_version,
+                       "cached_at": time.strftime("%Y-%m-%d %H:%M:%S")}
+    _save_manifest(cache_dir, manifest)
+    return target, "download"
+
+
+def resolve_chromedriver(cache_dir="drivers", pinned_path=None):
+    global _resolved
+    if _resolved:
+        return _resolved
+
+    started = time.perf_counter()
+    os.makedirs(cache_dir, exist_ok=True)
+    path, source = _resolve(os.path.abspath(cache_dir), pinned_path)
+    print(f"🧩 chromedriver ({source}) resolved in {time.perf_counter() - started:.2f}s")
+    _resolved = path
+    return path
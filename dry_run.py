@@ -0,0 +1,112 @@
+import datetime
+import os
+import time
+
+from config import settings
+from contacts import iter_chunks, find_number_column, clean_chunk, drop_known
+from templating import MessageTemplate, TemplateError
+from pacing import PacingScheduler
+
+# === Dry run ===
+# The ingestion half of a send - read, normalize, dedupe (against the
+# contact index too, if there is one), render - over the whole contact file
+# at full speed, with no browser. Prints what a real run would send, what it
+# would skip and why, and how long each stage took.
+#
+#   python cli.py dry-run --input contacts.csv --sample 3
+
+STAGES = ["read", "normalize", "dedupe", "render"]
+
+
+def run(args):
+    try:
+        template = MessageTemplate.from_file(settings["template_file"], escape=settings["template_escape"])
+    except (OSError, TemplateError) as error:
+        print(f"❌ {error}")
+        return 1
+
+    index = None
+    if not args.no_index and os.path.exists(settings["index_file"]):
+        from contact_index import ContactIndex
+
+        invalid_ttl = settings["invalid_ttl_days"] * 86400 if settings["invalid_ttl_days"] is not None else None
+        index = ContactIndex(settings["index_file"], settings["campaign"], invalid_ttl)
+
+    timings = dict.fromkeys(STAGES, 0.0)
+    skipped_rows = {}
+    seen = set()
+    samples = []
+    rows = usable = 0
+    shortest, longest, total_length = None, 0, 0
+    number_column = None
+
+    started = time.perf_counter()
+    chunks = iter_chunks(settings["input_file"], settings["chunk_size"])
+    try:
+        while True:
+            mark = time.perf_counter()
+            chunk = next(chunks, None)
+            timings["read"] += time.perf_counter() - mark
+            if chunk is None:
+                break
+            rows += len(chunk)
+            if number_column is None:
+                number_column = find_number_column(list(chunk.columns.astype(str).str.strip().str.lower()))
+
+            mark = time.perf_counter()
+            chunk = clean_chunk(chunk, number_column, settings["default_region"], skipped_rows)
+            timings["normalize"] += time.perf_counter() - mark
+
+            mark = time.perf_counter()
+            chunk = drop_known(chunk, seen, index, skipped_rows)
+            timings["dedupe"] += time.perf_counter() - mark
+
+            mark = time.perf_counter()
+            template.check_columns(chunk.columns)
+            messages = template.render_chunk(chunk)
+            timings["render"] += time.perf_counter() - mark
+
+            if len(messages):
+                lengths = messages.str.len()
+                shortest = min(shortest, int(lengths.min())) if shortest is not None else int(lengths.min())
+                longest = max(longest, int(lengths.max()))
+                total_length += int(lengths.sum())
+            if len(samples) < args.sample:
+                samples.extend(zip(chunk['number'][:args.sample - len(samples)], messages))
+            usable += len(chunk)
+    except TemplateError as error:
+        print(f"❌ {error}")
+        return 1
+    finally:
+        if index is not None:
+            index.close()
+    elapsed = time.perf_counter() - started
+
+    print("="*50)
+    print(f"🧪 Dry run of '{settings['input_file']}' (campaign '{settings['campaign']}')")
+    print("="*50)
+    print(f"📋 Rows read:       {rows:>10,}")
+    print(f"✅ Would send:      {usable:>10,}")
+    print(f"🧹 Skipped:         {sum(skipped_rows.values()):>10,}")
+    for reason, count in sorted(skipped_rows.items(), key=lambda item: -item[1]):
+        print(f"     {reason:20} {count:>8,}")
+    if index is None:
+        print("     (contact index not checked)")
+
+    print(f"\n⏱️  {'stage':10} {'seconds':>9} {'rows/s':>12}")
+    for stage in STAGES:
+        rate = f"{rows / timings[stage]:12,.0f}" if timings[stage] else f"{'-':>12}"
+        print(f"    {stage:10} {timings[stage]:9.3f} {rate}")
+    print(f"    {'total':10} {elapsed:9.3f} {rows / elapsed if elapsed else 0:12,.0f}")
+
+    if usable:
+        print(f"\n💬 Message length: {shortest} - {longest} characters (avg {total_length / usable:.0f})")
+        pacer = PacingScheduler(settings["max_per_minute"], settings["pacing_burst"],
+                                settings["hourly_cap"], settings["daily_cap"], settings["send_window"],
+                                settings["send_timezone"], settings["timezone_column"])
+        finish = datetime.datetime.fromtimestamp(pacer.projected_finish(usable))
+        print(f"📅 At the configured pacing, a send would finish no earlier than {finish:%Y-%m-%d %H:%M}")
+    for number, message in samples:
+        print(f"\n--- {number} ---\n{message}")
+    print("="*50)
+    return 0
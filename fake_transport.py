@@ -0,0 +1,131 @@
+import random
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from transport import MessagingTransport, SUCCESS, INVALID, SentUnconfirmed, LoggedOut
+
+# === Fake transport ===
+# Stands in for WhatsApp Web so the pipeline (ingest, pacing, retries,
+# journal, results, metrics) can run and be timed without a browser.
+# Each phase sleeps for a simulated latency (scaled by time_scale; 0 runs
+# at full speed and measures only our own overhead) and outcomes are drawn
+# from the configured rates:
+#   invalid_rate  number not on WhatsApp (fixed per number, so a retry
+#                 gets the same verdict)
+#   timeout_rate  composer never renders (transient)
+#   crash_rate    browser dies mid-contact (transient); the next contact
+#                 pays restart_seconds
+#   drift_every   every N contacts the working composer selector moves one
+#                 place down the list; each miss before it costs
+#                 probe_seconds, and the selector registry (if given) learns
+#                 the new order
+# `script` pins outcomes for specific numbers: {number: "invalid" |
+# "timeout" | "crash" | "unconfirmed" | "logged_out" | "success"};
+# "unconfirmed" presses ENTER and then never sees the bubble, "logged_out"
+# finds the QR code instead of the chat.
+
+LATENCIES = {
+    "navigate": 1.5,
+    "classify": 1.0,
+    "locate_composer": 0.2,
+    "insert": 0.3,
+    "send": 0.05,
+    "confirm": 0.8,
+}
+
+
+class FakeTransport(MessagingTransport):
+    def __init__(self, metrics, latencies=None, jitter=0.3, invalid_rate=0.05, timeout_rate=0.0,
+                 crash_rate=0.0, restart_seconds=15.0, drift_every=0, probe_seconds=0.1,
+                 selectors=None, selector_registry=None, script=None, time_scale=1.0, seed=0):
+        self.metrics = metrics
+        self.latencies = dict(LATENCIES, **(latencies or {}))
+        self.jitter = jitter
+        self.invalid_rate = invalid_rate
+        self.timeout_rate = timeout_rate
+        self.crash_rate = crash_rate
+        self.restart_seconds = restart_seconds
+        self.drift_every = drift_every
+        self.probe_seconds = probe_seconds
+        self.selectors = list(selectors or (selector_registry.ordered() if selector_registry else ["composer"]))
+        self.selector_registry = selector_registry
+        self.script = script or {}
+        self.time_scale = time_scale
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.sends = 0
+        self.crashed = False
+        self.restarts = 0
+        self.simulated_seconds = 0.0
+
+    def _pause(self, seconds):
+        self.simulated_seconds += seconds
+        if self.time_scale > 0:
+            time.sleep(seconds * self.time_scale)
+
+    def _phase(self, phase, extra=0.0):
+        mean = self.latencies[phase]
+        with self.metrics.span(phase):
+            self._pause(max(0.0, mean * (1 + self.random.uniform(-self.jitter, self.jitter))) + extra)
+
+    def _outcome(self, number):
+        if number in self.script:
+            return self.script[number]
+        if random.Random(f"{self.seed}:{number}").random() < self.invalid_rate:
+            return "invalid"
+        roll = self.random.random()
+        if roll < self.crash_rate:
+            return "crash"
+        if roll < self.crash_rate + self.timeout_rate:
+            return "timeout"
+        return "success"
+
+    def _live_selector(self):
+        if not self.drift_every:
+            return self.selectors[0]
+        return self.selectors[(self.sends // self.drift_every) % len(self.selectors)]
+
+    def _locate(self):
+        order = self.selector_registry.ordered() if self.selector_registry else self.selectors
+        live = self._live_selector()
+        misses = order.index(live) if live in order else len(order)
+        return order, live, misses * self.probe_seconds
+
+    def send(self, number, message):
+        self.sends += 1
+        if self.crashed:
+            self.crashed = False
+            self.restarts += 1
+            self._pause(self.restart_seconds)
+
+        outcome = self._outcome(number)
+        self._phase("navigate")
+
+        order, live, probe_cost = self._locate()
+        self._phase("classify", probe_cost if outcome != "invalid" else 0.0)
+        if outcome == "crash":
+            self.crashed = True
+            raise WebDriverException("chrome not reachable (simulated)")
+        if outcome == "invalid":
+            return INVALID
+        if outcome == "logged_out":
+            raise LoggedOut("Logged out of WhatsApp Web (simulated)")
+        if self.selector_registry is not None:
+            self.selector_registry.record(order, live, probe_cost)
+        if outcome == "timeout":
+            raise TimeoutException("Message box did not render (simulated)")
+
+        self._phase("locate_composer")
+        self._phase("insert")
+        self._phase("send")
+        self._phase("confirm")
+        if outcome == "unconfirmed":
+            raise SentUnconfirmed("Sent but not confirmed: Sent message did not appear in the chat (simulated)")
+        return SUCCESS
+
+    def summary(self):
+        lines = [f"🧪 Fake transport: {self.sends} sends, {self.simulated_seconds:.0f}s simulated"]
+        if self.restarts:
+            lines.append(f"🔁 Simulated browser restarts: {self.restarts}")
+        return lines
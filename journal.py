@@ -0,0 +1,83 @@
+import json
+import os
+import time
+
+# === Send journal ===
+# Append-only JSON-lines file: one line per contact outcome, flushed and
+# fsynced before the loop moves on, so a crash, kill or sleep loses nothing
+# that was already sent. `--resume` reads it back and skips contacts that
+# were completed under the same campaign.
+
+ERROR_PREFIX = "Error"
+
+
+def _ends_mid_line(path):
+    try:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+    except OSError:
+        return False  # missing or empty
+
+
+class SendJournal:
+    def __init__(self, path, campaign):
+        self.path = path
+        self.campaign = campaign
+        torn = _ends_mid_line(path)
+        self.file = open(path, "a", encoding="utf-8")
+        if torn:
+            # Close off a line torn by a crash so the next entry starts clean
+            self.file.write("\n")
+
+    def record(self, number, status, **extra):
+        entry = {"ts": time.strftime("%Y-%m-%d %H:%M:%S"), "campaign": self.campaign,
+                 "number": number, "status": status}
+        entry.update(extra)
+        self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+def read_journal(path):
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue  # torn last line from a crash mid-write
+
+
+# Epoch times of journal entries with the given status since `since`
+# (used to count earlier sends against the pacing caps)
+def status_times(path, status, since=0):
+    times = []
+    for entry in read_journal(path):
+        if entry.get("status") != status:
+            continue
+        try:
+            ts = time.mktime(time.strptime(entry["ts"], "%Y-%m-%d %H:%M:%S"))
+        except (KeyError, ValueError):
+            continue
+        if ts >= since:
+            times.append(ts)
+    return times
+
+
+# Numbers with a final outcome (sent or invalid) for the campaign; errors
+# are left out so they get another attempt
+def completed_numbers(path, campaign):
+    done = set()
+    for entry in read_journal(path):
+        if entry.get("campaign") != campaign:
+            continue
+        if str(entry.get("status", "")).startswith(ERROR_PREFIX):
+            done.discard(entry["number"])
+        else:
+            done.add(entry["number"])
+    return done
@@ -1,246 +1,190 @@
 import time
-import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-import re
-
-# === Step 1: Read Excel ===
-data = pd.read_excel("RAW_data.xlsx")
-
-# Check available columns
-print("📋 Available columns in Excel:")
-print(data.columns.tolist())
-print()
-
-# Clean column names (remove spaces)
-data.columns = data.columns.str.strip().str.lower()
-
-# Handle different possible column names
-if 'number' not in data.columns:
-    possible_names = ['phone', 'contact', 'mobile', 'telephone', 'phonenumber', 'phone number']
-    column_found = None
-    
-    for col in data.columns:
-        if col in possible_names or 'phone' in col or 'number' in col or 'contact' in col:
-            column_found = col
-            break
-    
-    if column_found:
-        print(f"⚠️  'number' column not found. Using '{column_found}' instead.")
-        data['number'] = data[column_found]
-    else:
-        print(f"⚠️  No phone number column found. Using first column: '{data.columns[0]}'")
-        data['number'] = data[data.columns[0]]
-    print()
-
-# Clean the 'number' column thoroughly
-data['number'] = data['number'].astype(str)
-# Remove ALL non-digit characters except +
-data['number'] = data['number'].str.replace(r'[^\d+]', '', regex=True)
-
-# Fix numbers that are too long (remove trailing zeros or extra digits)
-def fix_number(num):
-    if num.startswith('+1') and len(num) > 12:
-        return num[:12]  # US/Canada: +1 + 10 digits
-    elif num.startswith('+') and len(num) > 15:
-        return num[:15]
-    return num
-
-data['number'] = data['number'].apply(fix_number)
-
-# Remove empty or invalid numbers
-data = data[data['number'].str.len() > 5]
-data = data[data['number'] != 'nan']
-
-print("📋 Loaded numbers from Excel:")
-for i, num in enumerate(data['number'].tolist(), 1):
-    print(f"  {i}. {num}")
-print()
-
-if len(data) == 0:
-    print("❌ No valid phone numbers found in Excel file!")
-    exit()
-
-# === Step 2: Setup Chrome + WhatsApp Web ===
-chrome_options = Options()
-chrome_options.add_argument("--start-maximized")
-chrome_options.add_argument("--no-sandbox")
-chrome_options.add_argument("--disable-dev-shm-usage")
-chrome_options.add_argument("--disable-gpu")
-chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])
-
-driver = webdriver.Chrome(
-    service=Service(ChromeDriverManager().install()),
-    options=chrome_options
-)
-
-driver.get("https://web.whatsapp.com")
-print("🔐 Scan the QR code (if not logged in already)...")
-time.sleep(35)
-
-# Wait for WhatsApp to fully load
-try:
-    WebDriverWait(driver, 60).until(
-        EC.presence_of_element_located((By.XPATH, '//div[@contenteditable="true"]'))
+import itertools
+
+from config import settings
+from contacts import iter_contacts, count_rows, RESUMED
+from contact_index import ContactIndex, SUPPRESSED, ALREADY_SENT, DUPLICATE, CACHED_INVALID
+from journal import SendJournal, completed_numbers, status_times
+from result_sinks import open_sink
+from templating import MessageTemplate, TemplateError
+from pacing import PacingScheduler
+from metrics import PhaseMetrics
+
+# === Send command ===
+# Run with `python cli.py send` (see cli.py for the options and --config);
+# `python main.py [--resume] [--recheck-invalid]` still works the same way.
+# Selenium and the browser modules are only imported in Step 2, once the
+# contact file turned out to have something to send.
+
+# Rows dropped because they were dealt with before, not because the number
+# is unusable
+HANDLED_REASONS = {SUPPRESSED, ALREADY_SENT, DUPLICATE, CACHED_INVALID, RESUMED}
+
+
+def run(args):
+    # === Step 1: Read contacts ===
+    # Contacts stream in chunks from the file while messages are being sent
+    # (numbers are normalized to E.164; unusable, duplicate, suppressed and
+    # already-messaged rows are dropped here and counted in skipped_rows)
+    template = MessageTemplate.from_file(settings["template_file"], escape=settings["template_escape"])
+    invalid_ttl = settings["invalid_ttl_days"] * 86400 if settings["invalid_ttl_days"] is not None else None
+    contact_index = ContactIndex(settings["index_file"], settings["campaign"], invalid_ttl,
+                                 skip_invalid=not args.recheck_invalid)
+    skipped_rows = {}
+    already_done = set()
+    if args.resume:
+        already_done = completed_numbers(settings["journal_file"], settings["campaign"])
+        print(f"⏩ Resuming campaign '{settings['campaign']}': {len(already_done)} contacts already done")
+    contacts = iter_contacts(settings["input_file"], settings["chunk_size"],
+                             settings["default_region"], stats=skipped_rows, index=contact_index,
+                             done=already_done, template=template)
+
+    # Peek at the first contact so an empty file exits before Chrome starts
+    try:
+        first_contact = next(contacts, None)
+    except TemplateError as error:
+        print(f"❌ {error}")
+        return 1
+    if first_contact is None:
+        handled = {reason: count for reason, count in skipped_rows.items() if reason in HANDLED_REASONS}
+        if handled:
+            print(f"✅ Nothing left to send: {sum(handled.values())} rows were already handled "
+                  f"(campaign '{settings['campaign']}')")
+        else:
+            print("❌ No valid phone numbers found in the contact file!")
+        if skipped_rows:
+            print("🧹 Skipped while reading: " + ", ".join(f"{reason}: {count}" for reason, count in skipped_rows.items()))
+        return 0 if handled else 1
+    contacts = itertools.chain([first_contact], contacts)
+
+    # === Step 2: Setup Chrome + WhatsApp Web ===
+    # The persistent profile keeps the login, so the QR code is only needed
+    # when the saved session has expired
+    import whatsapp_web
+    from supervisor import BrowserSupervisor
+    from selector_registry import SelectorRegistry
+    from retries import RetryQueue
+    from transport import WhatsAppWebTransport, SUCCESS, LoggedOut
+    from delivery import DeliveryTracker
+    from sender import Sender
+
+    supervisor = BrowserSupervisor(settings["profile_dir"], settings["hot_standby"],
+                                   settings["standby_profile_dir"],
+                                   memory_check_every=settings["memory_check_every"],
+                                   max_js_heap_mb=settings["max_js_heap_mb"],
+                                   max_dom_nodes=settings["max_dom_nodes"],
+                                   recycle_mode=settings["recycle_mode"])
+    selector_registry = SelectorRegistry(
+        settings["selectors_file"],
+        settings["selector_stats_file"],
+        defaults=whatsapp_web.COMPOSER_SELECTORS,
+        demote_after=settings["selector_demote_after"],
     )
-    print("✅ WhatsApp Web loaded successfully!\n")
-except:
-    print("❌ WhatsApp Web failed to load. Please check your connection.")
-    driver.quit()
-    exit()
-
-# === Step 3: Message Template ===
-message = '''Hi Greetings from Innovacio Technologies Pvt. Ltd.!
-
-With 7 years of experience, we have successfully delivered projects across domains — including AI-driven platforms, fintech dashboards, healthtech apps, learning management systems, mobile apps and enterprise automation tools.
-
-Our Project Expertise:
-• AI LLM & RAG
-• AI App & Web
-• Generative AI
-• AI Agent Development
-• AI Detection
-• Data Science
-
-Our Core Skills:
-We specialize in AI, LLMs, Machine learning, Node.js, React, React Native, Next.js, JavaScript, Python, MySQL, MongoDB, SQL, and Machine Learning — enabling us to build intelligent, scalable, and high-performing digital solutions.
 
-Our Services:
-• We provide dedicated software developers and full-cycle development teams for:
-• Custom AI Solutions
-• Web & Mobile Applications
-• Enterprise Automation Platforms
+    # Per-phase timings: spans file + histograms exported for dashboards
+    metrics = PhaseMetrics(settings["metrics_file"], settings["spans_file"],
+                           settings["metrics_export_seconds"], settings["metrics_window"])
+    delivery = None
+    if settings["delivery_tracking"]:
+        delivery = DeliveryTracker(whatsapp_web.OUTGOING_BUBBLE_CSS, settings["delivery_poll_seconds"],
+                                   settings["delivery_timeout"])
+    transport = WhatsAppWebTransport(supervisor, selector_registry, metrics, delivery,
+                                     settings["delivery_final_wait"])
+
+    # Start Chrome and wait for WhatsApp to fully load (returns as soon as the chat list is up)
+    try:
+        started = time.time()
+        login = transport.start()
+        if login == "session":
+            print(f"✅ WhatsApp Web loaded with the saved session in {time.time() - started:.1f}s!\n")
+        else:
+            print("✅ WhatsApp Web loaded successfully!\n")
+    except:
+        print("❌ WhatsApp Web failed to load. Please check your connection.")
+        transport.quit()
+        return 1
+
+    # === Step 3: Message Template ===
+    # The message lives in settings["template_file"] and was compiled in Step 1;
+    # each contact's copy is rendered with its chunk during ingestion, so the
+    # loop below only reads row['message']
+    if template.is_static:
+        print("💬 Sending the same message to every contact\n")
+    else:
+        print(f"💬 Personalising the message with: {', '.join(template.fields)}\n")
+
+    # === Step 4: Loop through contacts ===
+    # Every outcome goes to the journal (fsynced) as soon as it is known and is
+    # streamed to the results file in small batches
+    journal = SendJournal(settings["journal_file"], settings["campaign"])
+    # (a resumed run keeps the earlier results)
+    results_sink = open_sink(settings["output_file"], flush_every=settings["flush_every"],
+                             flush_seconds=settings["flush_seconds"], append=args.resume)
+    if not results_sink.streaming:
+        print(f"⚠️  '{settings['output_file']}' is only written when the run ends (use .csv or .jsonl "
+              f"to follow along); until then '{settings['journal_file']}' has every outcome\n")
+
+    # Sends are paced by the scheduler (rate, hourly/daily caps, send window);
+    # sends already made in the last day count towards the caps
+    pacer = PacingScheduler(settings["max_per_minute"], settings["pacing_burst"],
+                            settings["hourly_cap"], settings["daily_cap"], settings["send_window"],
+                            settings["send_timezone"], settings["timezone_column"])
+    pacer.seed(status_times(settings["journal_file"], SUCCESS, since=time.time() - 86400))
+
+    # Transient failures are retried later with exponential backoff, in between
+    # fresh contacts
+    retry_queue = RetryQueue(settings["retry_attempts"], settings["retry_base_delay"],
+                             settings["retry_max_delay"], settings["retry_backoff"])
+
+    sender = Sender(transport, pacer, retry_queue, metrics, journal, results_sink,
+                    contact_index=contact_index, total_rows=count_rows(settings["input_file"]),
+                    skipped_rows=skipped_rows, projection_every=settings["projection_every"])
+    interrupted = False
+    try:
+        sender.run(contacts)
+    except KeyboardInterrupt:
+        interrupted = True
+        print("\n⏹️  Interrupted - saving what was processed (run again with --resume to continue)")
+    except LoggedOut as error:
+        interrupted = True
+        print(f"\n🔐 {error} - stopping. Log in, then run again with --resume to continue")
+    finally:
+        # === Step 5: Save Results ===
+        # Also on Ctrl-C or a crash: buffered rows are flushed, an xlsx or
+        # Parquet file is written, selector stats are saved and Chrome quits
+        results_sink.close()
+        journal.close()
+        metrics.close()
+        contact_index.close()
+        transport.quit()
+
+    if results_sink.rows_written:
+        print("\n" + "="*50)
+        print("⏹️  Run interrupted" if interrupted else "🎉 All messages processed!")
+        print("="*50)
+        print(f"📊 Results saved to '{settings['output_file']}'")
+        print(f"✅ Successful: {sender.success_count}")
+        print(f"❌ Failed/Invalid: {sender.failed_count}")
+        print(f"📝 Total: {results_sink.rows_written}")
+        for line in sender.summary():
+            print(line)
+        if contact_index.invalid_lookups:
+            print(f"🗂️  Invalid-number cache: {contact_index.invalid_hits} hits / {contact_index.invalid_lookups} "
+                  f"lookups ({contact_index.invalid_hits / contact_index.invalid_lookups:.1%})")
+        if skipped_rows:
+            print("🧹 Skipped while reading: " + ", ".join(f"{reason}: {count}" for reason, count in skipped_rows.items()))
+        print("="*50)
+    else:
+        print("\n⚠️ No messages were processed!")
 
-Would you be open to a quick consultation call this week?
+    return 130 if interrupted else 0
 
-Innovacio Technologies Pvt Ltd.'''.strip()
 
-# === Step 4: Loop through contacts ===
-results = []
-success_count = 0
-failed_count = 0
+if __name__ == "__main__":
+    import sys
+    import cli
 
-for index, row in data.iterrows():
-    number = str(row['number']).strip()
-    
-    # Skip empty numbers
-    if not number or number == 'nan':
-        continue
-    
-    print(f"📞 Processing [{index+1}/{len(data)}]: {number}")
-    
-    # Check if driver is still alive
-    try:
-        _ = driver.current_url
-    except:
-        print("❌ Browser crashed! Restarting...")
-        driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=chrome_options
-        )
-        driver.get("https://web.whatsapp.com")
-        print("Please scan QR code again...")
-        time.sleep(30)
-    
-    url = f"https://web.whatsapp.com/send?phone={number}"
-    
-    try:
-        driver.get(url)
-        time.sleep(10)  # Increased wait time
-        
-        # Check for invalid number alert - multiple ways
-        invalid_number = False
-        
-        # Method 1: Check for "Phone number shared via url is invalid" text
-        try:
-            invalid_alert = driver.find_element(By.XPATH, '//*[contains(text(), "Phone number shared via url is invalid")]')
-            invalid_number = True
-            print(f"   ❌ Invalid/Not on WhatsApp\n")
-            results.append({"number": number, "status": "Invalid/Not on WhatsApp"})
-            failed_count += 1
-            continue
-        except:
-            pass
-        
-        # Method 2: Wait for message input box (multiple possible selectors)
-        message_box = None
-        selectors = [
-            '//div[@contenteditable="true"][@data-tab="10"]',
-            '//div[@contenteditable="true"][@role="textbox"]',
-            '//div[@title="Type a message"]',
-            '//div[@contenteditable="true"][@data-lexical-editor="true"]',
-            '//p[@class="selectable-text copyable-text"]',
-            '//footer//div[@contenteditable="true"]'
-        ]
-        
-        for selector in selectors:
-            try:
-                message_box = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, selector))
-                )
-                print(f"   📝 Found message box")
-                break
-            except:
-                continue
-        
-        if not message_box:
-            print(f"   ❌ Could not find message box - Invalid/Not on WhatsApp\n")
-            results.append({"number": number, "status": "Invalid/Not on WhatsApp"})
-            failed_count += 1
-            continue
-        
-        # Click and type message
-        message_box.click()
-        time.sleep(2)
-        
-        # Send message line by line
-        lines = message.split("\n")
-        for i, line in enumerate(lines):
-            if line.strip():  # Only send non-empty lines
-                message_box.send_keys(line)
-            if i < len(lines) - 1:
-                message_box.send_keys(Keys.SHIFT + Keys.ENTER)
-        
-        time.sleep(2)
-        message_box.send_keys(Keys.ENTER)
-        
-        print(f"   ✅ Message sent successfully!\n")
-        results.append({"number": number, "status": "Success"})
-        success_count += 1
-        time.sleep(8)  # Increased delay to avoid rate limiting
-        
-    except Exception as e:
-        error_msg = str(e)[:100]
-        print(f"   ❌ Failed: {error_msg}\n")
-        results.append({"number": number, "status": f"Error: {error_msg}"})
-        failed_count += 1
-        time.sleep(3)
-
-# === Step 5: Save Results ===
-if results:
-    results_df = pd.DataFrame(results)
-    results_df.to_excel("message_results.xlsx", index=False)
-    print("\n" + "="*50)
-    print("🎉 All messages processed!")
-    print("="*50)
-    print(f"📊 Results saved to 'message_results.xlsx'")
-    print(f"✅ Successful: {success_count}")
-    print(f"❌ Failed/Invalid: {failed_count}")
-    print(f"📝 Total: {len(results)}")
-    print("="*50)
-else:
-    print("\n⚠️ No messages were processed!")
-
-try:
-    driver.quit()
-except:
-    pass
+    sys.exit(cli.main(["send"] + sys.argv[1:]))
 
 # import time
 # import pandas as pd
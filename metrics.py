@@ -0,0 +1,180 @@
+import bisect
+import collections
+import contextlib
+import json
+import os
+import time
+
+# === Phase metrics ===
+# Every contact is split into timed phases:
+#   navigate         open the chat (in-app search or /send?phone= URL)
+#   classify         wait until the page shows the composer or the invalid alert
+#   locate_composer  click the composer and wait for focus
+#   insert           put the message in and verify it
+#   send             press ENTER
+#   confirm          wait for the outgoing bubble
+# Each phase (and the whole contact) is written as one JSON line to the
+# spans file and added to a per-phase histogram. The histograms are exported
+# every few seconds as a Prometheus textfile (node_exporter's textfile
+# collector picks it up) or as JSON, chosen by the file extension.
+
+PHASES = ["navigate", "classify", "locate_composer", "insert", "send", "confirm"]
+
+# Seconds; the last bucket is +Inf
+BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60]
+
+PREFIX = "whatsapp_sender"
+
+
+class Histogram:
+    # Cumulative buckets since start plus the last `window` values for
+    # recent quantiles
+    def __init__(self, window=500):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.recent = collections.deque(maxlen=window)
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+        self.recent.append(value)
+
+    def quantile(self, q):
+        if not self.recent:
+            return None
+        values = sorted(self.recent)
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class PhaseMetrics:
+    def __init__(self, metrics_path=None, spans_path=None, export_seconds=30, window=500):
+        self.metrics_path = metrics_path
+        self.export_seconds = export_seconds
+        self.window = window
+        self.histograms = {}
+        self.outcomes = collections.Counter()
+        self.spans = open(spans_path, "a", encoding="utf-8") if spans_path else None
+        self._exported = time.monotonic()
+        self.contact = None
+
+    def _histogram(self, phase):
+        if phase not in self.histograms:
+            self.histograms[phase] = Histogram(self.window)
+        return self.histograms[phase]
+
+    def _emit(self, phase, started, seconds, ok):
+        self._histogram(phase).observe(seconds)
+        if self.spans:
+            self.spans.write(json.dumps({
+                "contact": self.contact, "phase": phase, "start": round(started, 3),
+                "seconds": round(seconds, 4), "ok": ok,
+            }) + "\n")
+
+    # with metrics.span("insert"): ...
+    @contextlib.contextmanager
+    def span(self, phase):
+        started = time.time()
+        clock = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self._emit(phase, started, time.perf_counter() - clock, ok)
+
+    # Wraps one contact: its phases are tagged with the number and the whole
+    # contact is recorded as the "contact" phase
+    @contextlib.contextmanager
+    def contact_span(self, number):
+        self.contact = number
+        try:
+            with self.span("contact"):
+                yield
+        finally:
+            self.contact = None
+            if self.spans:
+                self.spans.flush()
+            if time.monotonic() - self._exported >= self.export_seconds:
+                self.export()
+
+    def record_outcome(self, status):
+        self.outcomes[status] += 1
+
+    def _ordered_phases(self):
+        known = [phase for phase in PHASES + ["contact"] if phase in self.histograms]
+        return known + sorted(set(self.histograms) - set(known))
+
+    def to_dict(self):
+        phases = {}
+        for phase in self._ordered_phases():
+            histogram = self.histograms[phase]
+            phases[phase] = {
+                "count": histogram.count,
+                "sum": round(histogram.total, 4),
+                "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"],
+                                    _cumulative(histogram.counts))),
+                "recent_p50": histogram.quantile(0.5),
+                "recent_p95": histogram.quantile(0.95),
+            }
+        return {"ts": time.time(), "phases": phases, "outcomes": dict(self.outcomes)}
+
+    def to_prometheus(self):
+        name = f"{PREFIX}_phase_seconds"
+        lines = [f"# HELP {name} Time spent per contact phase",
+                 f"# TYPE {name} histogram"]
+        for phase in self._ordered_phases():
+            histogram = self.histograms[phase]
+            for bound, count in zip(BUCKETS + ["+Inf"], _cumulative(histogram.counts)):
+                lines.append(f'{name}_bucket{{phase="{phase}",le="{bound}"}} {count}')
+            lines.append(f'{name}_sum{{phase="{phase}"}} {histogram.total:.4f}')
+            lines.append(f'{name}_count{{phase="{phase}"}} {histogram.count}')
+
+        recent = f"{PREFIX}_phase_recent_seconds"
+        lines += [f"# HELP {recent} Phase time quantiles over the last {self.window} contacts",
+                  f"# TYPE {recent} gauge"]
+        for phase in self._ordered_phases():
+            for q in (0.5, 0.95):
+                value = self.histograms[phase].quantile(q)
+                if value is not None:
+                    lines.append(f'{recent}{{phase="{phase}",quantile="{q}"}} {value:.4f}')
+
+        outcomes = f"{PREFIX}_contacts_total"
+        lines += [f"# HELP {outcomes} Contacts processed by outcome",
+                  f"# TYPE {outcomes} counter"]
+        for status, count in sorted(self.outcomes.items()):
+            lines.append(f'{outcomes}{{status="{_label(status)}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    # Written to a temp file and renamed, so a scraper never sees half a file
+    def export(self):
+        self._exported = time.monotonic()
+        if not self.metrics_path:
+            return
+        if self.metrics_path.endswith(".json"):
+            content = json.dumps(self.to_dict(), indent=2)
+        else:
+            content = self.to_prometheus()
+        tmp_path = self.metrics_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, self.metrics_path)
+
+    def close(self):
+        self.export()
+        if self.spans:
+            self.spans.close()
+
+
+def _cumulative(counts):
+    total = 0
+    result = []
+    for count in counts:
+        total += count
+        result.append(total)
+    return result
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
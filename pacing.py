@@ -0,0 +1,225 @@
+import bisect
+import collections
+import datetime
+import heapq
+import itertools
+import re
+import time
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:
+    ZoneInfo = None
+
+# === Pacing scheduler ===
+# Replaces the fixed sleeps after each contact. Sends are paced by a token
+# bucket (max_per_minute, with up to `burst` sends back to back), counted
+# against a rolling hourly cap and a daily cap, and only happen inside the
+# send window - in the recipient's time zone when the contact file has a
+# time zone column, else in the sender's.
+#
+# A token is taken when a contact is handed out; the sender gives it back
+# (refund) when the contact sent nothing - an invalid number or a failure
+# before ENTER - so only real sends are paced.
+#
+# Contacts whose window is closed don't hold up the queue: they are parked
+# in a heap ordered by when their window opens and the next contact that
+# can go now is sent instead. The loop only ever sleeps until the exact time
+# the next send is allowed.
+
+HOUR = 3600
+DAY = 86400
+
+# "+05:30", "UTC-4", "GMT+1"
+UTC_OFFSET = re.compile(r"^(?:UTC|GMT)?\s*([+-])(\d{1,2})(?::?(\d{2}))?$", re.IGNORECASE)
+
+
+def parse_timezone(name):
+    if name is None or str(name).strip().lower() in ("", "nan", "none"):
+        return None
+    name = str(name).strip()
+    offset = UTC_OFFSET.match(name)
+    if offset:
+        sign, hours, minutes = offset.groups()
+        delta = datetime.timedelta(hours=int(hours), minutes=int(minutes or 0))
+        return datetime.timezone(-delta if sign == "-" else delta)
+    if name.upper() in ("UTC", "GMT", "Z"):
+        return datetime.timezone.utc
+    if ZoneInfo is None:
+        return None
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def _parse_clock(value):
+    hours, minutes = value.split(":")
+    return datetime.time(int(hours), int(minutes))
+
+
+class SendWindow:
+    # start/end as "HH:MM"; a window like 21:00-06:00 runs past midnight
+    def __init__(self, start, end):
+        self.start = _parse_clock(start)
+        self.end = _parse_clock(end)
+
+    def contains(self, moment):
+        clock = moment.time()
+        if self.start <= self.end:
+            return self.start <= clock < self.end
+        return clock >= self.start or clock < self.end
+
+    # Epoch seconds of the earliest time >= ts inside the window
+    def next_open(self, ts, tz=None):
+        moment = datetime.datetime.fromtimestamp(ts, tz)
+        if self.contains(moment):
+            return ts
+        opening = datetime.datetime.combine(moment.date(), self.start, tzinfo=moment.tzinfo)
+        if opening <= moment:
+            opening += datetime.timedelta(days=1)
+        return opening.timestamp()
+
+
+class PacingScheduler:
+    def __init__(self, max_per_minute, burst=1, hourly_cap=None, daily_cap=None,
+                 window=None, timezone=None, timezone_column=None, lookahead=1000):
+        self.interval = 60.0 / max_per_minute
+        self.burst = max(1, burst)
+        self.hourly_cap = hourly_cap
+        self.daily_cap = daily_cap
+        self.window = SendWindow(*window) if window else None
+        self.timezone = parse_timezone(timezone)   # None = this machine's local time
+        self.timezone_column = timezone_column
+        self.lookahead = lookahead
+        self.tokens = float(self.burst)
+        self._refilled = time.time()
+        self.last_hour = []      # send times within the last hour, oldest first
+        self.sent_per_day = collections.Counter()
+        self.deferred = 0
+        self.waited_seconds = 0.0
+        self._timezones = {}
+
+    # Sends made before this run (from the journal) count towards the caps
+    def seed(self, timestamps):
+        now = time.time()
+        for ts in sorted(timestamps):
+            if ts > now - DAY:
+                self.record_sent(ts)
+
+    def record_sent(self, ts=None):
+        ts = time.time() if ts is None else ts
+        self.last_hour.append(ts)
+        del self.last_hour[:bisect.bisect_right(self.last_hour, ts - HOUR)]
+        self.sent_per_day[self._day(ts)] += 1
+
+    def _day(self, ts):
+        return datetime.datetime.fromtimestamp(ts, self.timezone).date()
+
+    def _next_day(self, ts):
+        tomorrow = datetime.datetime.combine(
+            self._day(ts) + datetime.timedelta(days=1), datetime.time(), tzinfo=self.timezone
+        )
+        return tomorrow.timestamp()
+
+    def _contact_timezone(self, contact):
+        if not self.timezone_column:
+            return self.timezone
+        name = contact.get(self.timezone_column)
+        if name not in self._timezones:
+            self._timezones[name] = parse_timezone(name)
+        return self._timezones[name] or self.timezone
+
+    # Earliest time >= ts allowed by the caps (window and tokens aside)
+    def _caps_allow(self, ts, last_hour, sent_per_day):
+        while True:
+            in_hour = len(last_hour) - bisect.bisect_right(last_hour, ts - HOUR)
+            if self.hourly_cap and in_hour >= self.hourly_cap:
+                ts = last_hour[len(last_hour) - self.hourly_cap] + HOUR
+                continue
+            if self.daily_cap and sent_per_day[self._day(ts)] >= self.daily_cap:
+                ts = self._next_day(ts)
+                continue
+            return ts
+
+    def _window_allows(self, ts, tz):
+        return self.window.next_open(ts, tz) if self.window else ts
+
+    def _tokens_at(self, ts):
+        return min(self.burst, self.tokens + max(0.0, ts - self._refilled) / self.interval)
+
+    # Earliest time the contact can be sent
+    def ready_at(self, contact, now=None):
+        now = time.time() if now is None else now
+        tokens = self._tokens_at(now)
+        ts = now if tokens >= 1 else now + (1 - tokens) * self.interval
+        tz = self._contact_timezone(contact)
+        while True:
+            allowed = self._window_allows(self._caps_allow(ts, self.last_hour, self.sent_per_day), tz)
+            if allowed == ts:
+                return ts
+            ts = allowed
+
+    def _take_token(self, now):
+        self.tokens = self._tokens_at(now) - 1
+        self._refilled = now
+
+    # The last contact handed out sent nothing: its token goes back
+    def refund(self):
+        self.tokens = min(self.burst, self.tokens + 1)
+
+    def _sleep_until(self, ts):
+        delay = ts - time.time()
+        if delay > 0:
+            self.waited_seconds += delay
+            time.sleep(delay)
+
+    # Yields contacts in send order, each at the moment it may be sent
+    def schedule(self, contacts):
+        contacts = iter(contacts)
+        order = itertools.count()
+        parked = []   # (window opens, order, contact)
+        exhausted = False
+        while True:
+            now = time.time()
+            # Look further ahead only while the earliest parked contact can't go now
+            while not exhausted and len(parked) < self.lookahead and (not parked or parked[0][0] > now):
+                contact = next(contacts, None)
+                if contact is None:
+                    exhausted = True
+                    break
+                opens = self._window_allows(now, self._contact_timezone(contact))
+                if opens > now:
+                    self.deferred += 1
+                heapq.heappush(parked, (opens, next(order), contact))
+            if not parked:
+                return
+
+            opens, position, contact = heapq.heappop(parked)
+            slot = self.ready_at(contact, max(now, opens))
+            if parked and slot > parked[0][0]:
+                # Waiting pushed this one past another contact's window opening
+                heapq.heappush(parked, (slot, position, contact))
+                continue
+            self._sleep_until(slot)
+            self._take_token(time.time())
+            yield contact
+
+    # Simulated finish time for `remaining` more sends at the configured pace
+    # (or seconds_per_contact if sending itself is slower), using the sender's
+    # window. Returns epoch seconds.
+    def projected_finish(self, remaining, seconds_per_contact=None, now=None):
+        ts = time.time() if now is None else now
+        step = max(self.interval, seconds_per_contact or 0)
+        last_hour = list(self.last_hour)
+        sent_per_day = collections.Counter(self.sent_per_day)
+        for _ in range(remaining):
+            while True:
+                allowed = self._window_allows(self._caps_allow(ts, last_hour, sent_per_day), self.timezone)
+                if allowed == ts:
+                    break
+                ts = allowed
+            last_hour.append(ts)
+            sent_per_day[self._day(ts)] += 1
+            ts += step
+        return ts
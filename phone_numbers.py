@@ -0,0 +1,179 @@
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+
+# === Phone number normalization ===
+# Works on a whole column at once (pandas string ops, no per-row Python) and
+# turns whatever is in the sheet into E.164 (+<country code><number>) using
+# the offline table in country_codes.csv. Every number also gets a reason
+# code, so bad rows are dropped with an explanation before any browser work.
+# Numbers written with + or 00 whose calling code isn't in the table are
+# kept as they are when they have 8-15 digits (E.164 length).
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "country_codes.csv")
+
+# Reason codes
+OK = "ok"                                # had a country code
+OK_NATIONAL = "ok_national"              # no country code, default region applied
+EMPTY = "empty"
+NOT_A_NUMBER = "not_a_number"            # no digits at all
+UNKNOWN_COUNTRY = "unknown_country_code"
+TOO_SHORT = "too_short"
+TOO_LONG = "too_long"
+
+VALID_REASONS = (OK, OK_NATIONAL)
+
+# Digits in a full E.164 number, for explicitly international numbers whose
+# calling code isn't in the table
+E164_MIN_DIGITS = 8
+E164_MAX_DIGITS = 15
+
+
+def load_country_table(path=TABLE_PATH):
+    regions = {}   # region -> (calling code, trunk prefix)
+    lengths = {}   # calling code -> (min, max) national number length
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            code = row["calling_code"]
+            regions[row["region"].upper()] = (code, row["trunk_prefix"])
+            low, high = int(row["min_length"]), int(row["max_length"])
+            if code in lengths:
+                low, high = min(low, lengths[code][0]), max(high, lengths[code][1])
+            lengths[code] = (low, high)
+    return regions, lengths
+
+
+REGIONS, LENGTHS = load_country_table()
+MIN_LENGTH = {code: low for code, (low, high) in LENGTHS.items()}
+MAX_LENGTH = {code: high for code, (low, high) in LENGTHS.items()}
+# Regions sharing a calling code share the trunk prefix (US/CA, RU/KZ)
+TRUNK_PREFIX = {code: trunk for code, trunk in REGIONS.values()}
+CODE_SIZES = sorted({len(code) for code in LENGTHS})
+
+
+# Arrow-backed strings make the .str operations run in C; without pyarrow
+# the same code runs on plain object columns, just slower.
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    STRING_DTYPE = "string[pyarrow]"
+except ImportError:
+    pa = None
+    STRING_DTYPE = object
+
+
+# .str[a:b] is still a Python loop for Arrow strings in pandas 2.2, so slice
+# with the Arrow kernel directly
+def _slice(strings, start, stop=None):
+    if pa is None:
+        return strings.str[start:stop]
+    sliced = pc.utf8_slice_codeunits(pa.array(strings.array), start, stop if stop is not None else 2**31 - 1)
+    return pd.Series(pd.arrays.ArrowStringArray(sliced), index=strings.index)
+
+
+def _head(strings, size):
+    return _slice(strings, 0, size)
+
+
+def _drop_head(strings, size):
+    return _slice(strings, size)
+
+
+def _mask(condition):
+    if hasattr(condition, "fillna"):
+        condition = condition.fillna(False)
+    return np.asarray(condition, dtype=bool)
+
+
+def _clean_raw(values):
+    raw = pd.Series(values, dtype=object)
+    raw = raw.where(raw.notna(), "").astype(str).astype(STRING_DTYPE)
+    # Escaped control characters left in cells by Excel (_x000d_ = CR)
+    raw = raw.str.replace(r"_x[0-9A-Fa-f]{4}_", "", regex=True).str.strip()
+
+    # Excel float artifacts: 9.19876543210E+11 and 919876543210.0
+    scientific = raw.str.fullmatch(r"\d(\.\d+)?[eE]\+?\d+")
+    if scientific.any():
+        raw = raw.mask(scientific, raw[scientific].map(lambda v: str(int(float(v)))))
+    return raw.str.replace(r"^(\+?\d+)\.0+$", r"\1", regex=True)
+
+
+# Calling codes are prefix-free, so at most one prefix size can match
+def _split_country_code(digits):
+    code = pd.Series("", index=digits.index, dtype=STRING_DTYPE)
+    rest = digits
+    for size in CODE_SIZES:
+        prefix = _head(digits, size)
+        hit = (code == "") & prefix.isin(LENGTHS.keys())
+        code = code.mask(hit, prefix)
+        rest = rest.mask(hit, _drop_head(digits, size))
+    return code, rest
+
+
+# Drop a trunk prefix ("0" in +91 0987...) only when that fixes the length
+def _strip_trunk(nsn, trunk, low, high):
+    for prefix in set(trunk.unique()) - {""}:
+        stripped = _drop_head(nsn, len(prefix))
+        fix = ((trunk == prefix) & nsn.str.startswith(prefix)
+               & ~nsn.str.len().between(low, high)
+               & stripped.str.len().between(low, high))
+        nsn = nsn.mask(fix, stripped)
+    return nsn
+
+
+def normalize_numbers(values, default_region="IN"):
+    region = default_region.upper()
+    if region not in REGIONS:
+        raise ValueError(f"Unknown default region '{default_region}' (not in {TABLE_PATH})")
+    region_code, region_trunk = REGIONS[region]
+
+    raw = _clean_raw(values)
+    empty = (raw == "") | raw.str.lower().isin(["nan", "none", "nat"])
+    starts_00 = raw.str.startswith("00")
+    international = raw.str.startswith("+") | starts_00
+    digits = raw.str.replace(r"\D", "", regex=True)
+    digits = digits.mask(starts_00, _drop_head(digits, 2))
+
+    # Read as a number in the default region (trunk prefix allowed)
+    national = _strip_trunk(
+        digits,
+        pd.Series(region_trunk, index=digits.index, dtype=STRING_DTYPE),
+        MIN_LENGTH[region_code], MAX_LENGTH[region_code],
+    )
+    national_len = national.str.len()
+    national_ok = national_len.between(MIN_LENGTH[region_code], MAX_LENGTH[region_code])
+    use_national = ~international & national_ok
+
+    # Read as <country code><number>, with or without the leading +
+    code, nsn = _split_country_code(digits)
+    low = code.map(MIN_LENGTH).fillna(0)
+    high = code.map(MAX_LENGTH).fillna(0)
+    nsn = _strip_trunk(nsn, code.map(TRUNK_PREFIX).fillna(""), low, high)
+    nsn_len = nsn.str.len()
+    too_short = nsn_len < low
+    too_long = nsn_len > high
+    intl_ok = (code != "") & ~too_short & ~too_long
+
+    # Written with + or 00 but the calling code isn't in the table: the
+    # number says it is complete, so keep it if its length is plausible
+    unlisted = international & (code == "") & digits.str.len().between(E164_MIN_DIGITS, E164_MAX_DIGITS)
+
+    number = ("+" + code + nsn).where(intl_ok, "")
+    number = number.mask(unlisted, "+" + digits)
+    number = number.mask(use_national, "+" + region_code + national)
+
+    local = ~international & ~intl_ok
+    conditions = [empty, digits == "", use_national,
+                  local & (national_len < MIN_LENGTH[region_code]), local,
+                  unlisted, code == "", too_short, too_long]
+    reason = np.select(
+        [_mask(condition) for condition in conditions],
+        [EMPTY, NOT_A_NUMBER, OK_NATIONAL,
+         TOO_SHORT, TOO_LONG,
+         OK, UNKNOWN_COUNTRY, TOO_SHORT, TOO_LONG],
+        default=OK,
+    )
+    number = number.where(~empty, "")
+    return pd.DataFrame({"number": number, "reason": reason}, index=raw.index)
@@ -0,0 +1,161 @@
+import csv
+import json
+import os
+import time
+
+# === Result sinks ===
+# Results are streamed to the output file as the run goes instead of being
+# collected in memory and written in Step 5. Rows are buffered and flushed
+# every `flush_every` rows or `flush_seconds` seconds, whichever comes first.
+# CSV and JSONL can be opened at any time during the run; Parquet and xlsx
+# only become readable once the sink is closed (their footers are written
+# last) - the send journal covers the in-progress view for those.
+# With append (--resume) the rows of an earlier run are kept: CSV and JSONL
+# append to the file, Parquet and xlsx copy the old rows into the new file,
+# which only replaces the old one on close.
+
+FIELDS = ["number", "status", "attempts", "delivery", "ts"]
+
+
+class ResultSink:
+    streaming = True   # readable while the run is going
+
+    def __init__(self, path, fields=FIELDS, flush_every=50, flush_seconds=10, append=False):
+        self.path = path
+        self.append = append and os.path.exists(path) and os.path.getsize(path) > 0
+        self.fields = fields
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.buffer = []
+        self.rows_written = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, row):
+        self.buffer.append(row)
+        if (len(self.buffer) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_seconds):
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self._write_rows(self.buffer)
+            self.rows_written += len(self.buffer)
+            self.buffer = []
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self._close()
+
+    def _write_rows(self, rows):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+
+class CsvSink(ResultSink):
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        if self.append:
+            self.file = open(path, "a", newline="", encoding="utf-8")
+        else:
+            self.file = open(path, "w", newline="", encoding="utf-8-sig")
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fields, extrasaction="ignore")
+        if not self.append:
+            self.writer.writeheader()
+        self.file.flush()
+
+    def _write_rows(self, rows):
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def _close(self):
+        self.file.close()
+
+
+class JsonlSink(ResultSink):
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        self.file = open(path, "a" if self.append else "w", encoding="utf-8")
+
+    def _write_rows(self, rows):
+        self.file.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+        self.file.flush()
+
+    def _close(self):
+        self.file.close()
+
+
+# One row group per flush, written to a temp file that replaces `path` on close
+class ParquetSink(ResultSink):
+    streaming = False
+
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Writing Parquet results needs pyarrow (pip install pyarrow)")
+        self.pa = pa
+        self.schema = pa.schema([(field, pa.string()) for field in self.fields])
+        self.writer = pq.ParquetWriter(path + ".tmp", self.schema)
+        if self.append:
+            earlier = pq.read_table(path)
+            columns = {field: earlier.column(field).cast(pa.string()) if field in earlier.column_names
+                       else pa.nulls(earlier.num_rows, pa.string()) for field in self.fields}
+            self.writer.write_table(pa.Table.from_pydict(columns, schema=self.schema))
+
+    def _write_rows(self, rows):
+        columns = {field: [None if row.get(field) is None else str(row.get(field)) for row in rows]
+                   for field in self.fields}
+        self.writer.write_table(self.pa.Table.from_pydict(columns, schema=self.schema))
+
+    def _close(self):
+        self.writer.close()
+        os.replace(self.path + ".tmp", self.path)
+
+
+# openpyxl write-only mode streams rows to a temp file instead of building
+# the whole sheet in memory
+class XlsxSink(ResultSink):
+    streaming = False
+
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        from openpyxl import Workbook, load_workbook
+
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet("Results")
+        self.sheet.append(self.fields)
+        if self.append:
+            earlier = load_workbook(path, read_only=True)
+            rows = earlier.active.iter_rows(values_only=True)
+            header = [str(name) for name in next(rows, ())]
+            for values in rows:
+                row = dict(zip(header, values))
+                self.sheet.append([row.get(field) for field in self.fields])
+            earlier.close()
+
+    def _write_rows(self, rows):
+        for row in rows:
+            self.sheet.append([row.get(field) for field in self.fields])
+
+    def _close(self):
+        self.workbook.save(self.path)
+
+
+SINKS = {
+    ".csv": CsvSink,
+    ".jsonl": JsonlSink,
+    ".parquet": ParquetSink,
+    ".xlsx": XlsxSink,
+}
+
+
+def open_sink(path, **kwargs):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in SINKS:
+        raise ValueError(f"Unsupported results file type '{ext}' (use .csv, .jsonl, .parquet or .xlsx)")
+    return SINKS[ext](path, **kwargs)
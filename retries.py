@@ -0,0 +1,95 @@
+import heapq
+import itertools
+import time
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException, ElementNotInteractableException, NoSuchElementException,
+    StaleElementReferenceException, TimeoutException,
+)
+
+from supervisor import is_dead_session_error
+from whatsapp_web import SentUnconfirmed
+
+# === Retry queue ===
+# Failures are sorted into two classes:
+#   transient - the page was slow or changed under us (timeouts, stale or
+#               covered elements, a browser that died mid-contact); the same
+#               contact will likely work a bit later
+#   permanent - anything else; retrying would fail the same way. A send
+#               that went out but wasn't confirmed (SentUnconfirmed) is
+#               never retried either: that could message the person twice
+# Transient failures go back into a queue with exponential backoff. Due
+# retries are handed out between fresh contacts, so a contact waiting for
+# its retry never holds up the rest of the file.
+
+TRANSIENT = "transient"
+PERMANENT = "permanent"
+
+TRANSIENT_ERRORS = (
+    TimeoutException,
+    StaleElementReferenceException,
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    NoSuchElementException,
+)
+
+
+def classify_error(error):
+    if isinstance(error, SentUnconfirmed):
+        return PERMANENT
+    if isinstance(error, TRANSIENT_ERRORS) or is_dead_session_error(error):
+        return TRANSIENT
+    return PERMANENT
+
+
+class RetryQueue:
+    # A contact gets at most max_attempts tries in total; the n-th retry
+    # waits base_delay * factor**(n-1) seconds, up to max_delay
+    def __init__(self, max_attempts=3, base_delay=60, max_delay=900, factor=2):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.pending = []   # (due, order, contact)
+        self._order = itertools.count()
+        self.retried = 0
+        self.recovered = 0
+
+    def __len__(self):
+        return len(self.pending)
+
+    def delay(self, attempts):
+        return min(self.max_delay, self.base_delay * self.factor ** (attempts - 1))
+
+    # Queues the contact for another try if it has attempts left. Returns the
+    # delay in seconds, or None when the contact is out of attempts.
+    def push(self, contact):
+        attempts = contact.get("attempts", 1)
+        if attempts >= self.max_attempts:
+            return None
+        delay = self.delay(attempts)
+        retry = dict(contact, attempts=attempts + 1)
+        heapq.heappush(self.pending, (time.time() + delay, next(self._order), retry))
+        self.retried += 1
+        return delay
+
+    def _pop_due(self, now):
+        if self.pending and self.pending[0][0] <= now:
+            return heapq.heappop(self.pending)[2]
+        return None
+
+    # Fresh contacts (first attempt) with due retries slotted in ahead of
+    # them. Once the fresh ones run out, waits for whatever is still queued.
+    def interleave(self, contacts):
+        for contact in contacts:
+            retry = self._pop_due(time.time())
+            while retry is not None:
+                yield retry
+                retry = self._pop_due(time.time())
+            yield dict(contact, attempts=1)
+
+        while self.pending:
+            delay = self.pending[0][0] - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            yield heapq.heappop(self.pending)[2]
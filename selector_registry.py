@@ -0,0 +1,84 @@
+import json
+import os
+import time
+
+# === Composer selector registry ===
+# Selectors come from a JSON config file. The registry remembers which one
+# matched last and tries it first, pushes selectors that keep missing to the
+# back, and keeps per-selector hit/miss counts and timings in a stats file so
+# what it learned survives between runs.
+
+
+class SelectorRegistry:
+    def __init__(self, config_path, stats_path, defaults=(), demote_after=5, autosave_every=20):
+        self.config_path = config_path
+        self.stats_path = stats_path
+        self.demote_after = demote_after
+        self.autosave_every = autosave_every
+        self.selectors = self._load_selectors(defaults)
+        self.stats = {}
+        self.last_match = None
+        self._unsaved = 0
+        self._load_stats()
+
+    def _load_selectors(self, defaults):
+        if os.path.exists(self.config_path):
+            with open(self.config_path, encoding="utf-8") as f:
+                selectors = json.load(f).get("selectors", [])
+            if selectors:
+                return list(selectors)
+        return list(defaults)
+
+    def _load_stats(self):
+        if not os.path.exists(self.stats_path):
+            return
+        try:
+            with open(self.stats_path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            print(f"⚠️  Could not read '{self.stats_path}', starting with fresh selector stats.")
+            return
+        self.stats = saved.get("selectors", {})
+        if saved.get("last_match") in self.selectors:
+            self.last_match = saved["last_match"]
+
+    def _entry(self, selector):
+        return self.stats.setdefault(selector, {
+            "hits": 0, "misses": 0, "miss_streak": 0, "total_ms": 0.0, "last_hit": None,
+        })
+
+    # Last match first, then healthy selectors in config order, then the
+    # ones that missed `demote_after` times in a row.
+    def ordered(self):
+        def rank(item):
+            index, selector = item
+            streak = self.stats.get(selector, {}).get("miss_streak", 0)
+            return (selector != self.last_match, streak >= self.demote_after, index)
+        return [selector for _, selector in sorted(enumerate(self.selectors), key=rank)]
+
+    # `tried` is the order that was probed; everything ahead of `matched`
+    # missed. matched=None means no selector matched at all.
+    def record(self, tried, matched, elapsed):
+        for selector in tried:
+            entry = self._entry(selector)
+            if selector == matched:
+                entry["hits"] += 1
+                entry["miss_streak"] = 0
+                entry["total_ms"] += elapsed * 1000
+                entry["last_hit"] = time.strftime("%Y-%m-%d %H:%M:%S")
+                self.last_match = selector
+                break
+            entry["misses"] += 1
+            entry["miss_streak"] += 1
+
+        self._unsaved += 1
+        if self._unsaved >= self.autosave_every:
+            self.save()
+
+    def save(self):
+        data = {"last_match": self.last_match, "selectors": self.stats}
+        tmp_path = self.stats_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.stats_path)
+        self._unsaved = 0
@@ -0,0 +1,163 @@
+import time
+
+from retries import classify_error, TRANSIENT
+from metrics import PHASES
+from transport import SUCCESS, INVALID, SentUnconfirmed, LoggedOut
+from delivery import UNCONFIRMED
+
+# Journal entry written when a sent message's delivery status resolves
+DELIVERY = "Delivery"
+
+# === Send loop ===
+# Takes the contact stream and pushes every contact through the transport:
+# due retries are slotted in between fresh contacts, the pacing scheduler
+# decides when each one goes, and every outcome is written to the journal,
+# the results file, the contact index and the phase metrics. When the
+# transport tracks delivery, a successful send goes to the journal at once
+# but its results row waits until the delivery status is known. A send
+# that went out but couldn't be confirmed counts as sent (delivery
+# "unconfirmed") and is never retried.
+
+
+class Sender:
+    def __init__(self, transport, pacer, retry_queue, metrics, journal, results_sink,
+                 contact_index=None, total_rows=0, skipped_rows=None, projection_every=50,
+                 verbose=True):
+        self.transport = transport
+        self.pacer = pacer
+        self.retry_queue = retry_queue
+        self.metrics = metrics
+        self.journal = journal
+        self.results_sink = results_sink
+        self.contact_index = contact_index
+        self.total_rows = total_rows
+        self.skipped_rows = skipped_rows if skipped_rows is not None else {}
+        self.projection_every = projection_every
+        self.verbose = verbose
+        self.success_count = 0
+        self.failed_count = 0
+        self.processed = 0
+        self.busy_seconds = 0.0
+        self.awaiting_delivery = {}   # number -> attempts
+
+    def _print(self, text):
+        if self.verbose:
+            print(text)
+
+    def record_result(self, number, status, attempts=1, delivery=None, **extra):
+        self.results_sink.write({"number": number, "status": status, "attempts": attempts,
+                                 "delivery": delivery, "ts": time.strftime("%Y-%m-%d %H:%M:%S")})
+        if delivery is not None:
+            extra["delivery"] = delivery
+        self.journal.record(number, status, attempts=attempts, **extra)
+
+    def record_deliveries(self, final=False):
+        for number, delivery, seconds in self.transport.delivery_updates(final):
+            attempts = self.awaiting_delivery.pop(number, 1)
+            self.results_sink.write({"number": number, "status": SUCCESS, "attempts": attempts,
+                                     "delivery": delivery, "ts": time.strftime("%Y-%m-%d %H:%M:%S")})
+            self.journal.record(number, DELIVERY, attempts=attempts, delivery=delivery,
+                                delivery_seconds=round(seconds, 1))
+
+    def print_projection(self):
+        remaining = max(self.total_rows - self.processed - sum(self.skipped_rows.values()), 0)
+        per_contact = self.busy_seconds / self.processed if self.processed else None
+        finish = self.pacer.projected_finish(remaining, per_contact)
+        self._print(f"🗓️  ~{remaining} contacts left, projected to finish "
+                    f"{time.strftime('%a %d %b %H:%M', time.localtime(finish))}\n")
+
+    def run(self, contacts):
+        self.print_projection()
+        for index, row in enumerate(self.pacer.schedule(self.retry_queue.interleave(contacts))):
+            if index and index % self.projection_every == 0:
+                self.print_projection()
+            number = str(row['number']).strip()
+
+            # Skip empty numbers
+            if not number or number == 'nan':
+                continue
+
+            attempts = row['attempts']
+            retry_note = f" (attempt {attempts})" if attempts > 1 else ""
+            self._print(f"📞 Processing [{index+1}]: {number}{retry_note}")
+
+            contact_started = time.time()
+            self.send_one(number, row)
+            self.busy_seconds += time.time() - contact_started
+            self.processed += 1
+            self.record_deliveries()
+        self.record_deliveries(final=True)
+
+    def send_one(self, number, row):
+        attempts = row['attempts']
+        try:
+            with self.metrics.contact_span(number):
+                status = self.transport.send(number, row['message'])
+            self.metrics.record_outcome(status)
+            if status == SUCCESS and self.transport.tracks_delivery:
+                self.awaiting_delivery[number] = attempts
+                self.journal.record(number, status, attempts=attempts, delivery="pending")
+            else:
+                self.record_result(number, status, attempts)
+
+            if status == SUCCESS:
+                self.count_sent(number, attempts)
+            else:
+                if status == INVALID and self.contact_index is not None:
+                    self.contact_index.mark_invalid(number)
+                self.pacer.refund()
+                self.failed_count += 1
+
+        except LoggedOut:
+            # Session-level: ends the run; the contact stays unrecorded, so
+            # --resume picks it up
+            self.pacer.refund()
+            raise
+
+        except SentUnconfirmed as e:
+            # ENTER went out but the bubble never showed: a retry could
+            # message the person twice, so it is recorded as sent
+            self._print(f"   ⚠️  {e}\n")
+            self.metrics.record_outcome("sent_unconfirmed")
+            self.record_result(number, SUCCESS, attempts, delivery=UNCONFIRMED, note=str(e)[:100])
+            self.count_sent(number, attempts)
+
+        except Exception as e:
+            error_msg = (str(e).strip().splitlines() or [type(e).__name__])[0][:100]
+            error_class = classify_error(e)
+            self.pacer.refund()  # failed before ENTER: nothing was sent
+            retry_in = self.retry_queue.push(row) if error_class == TRANSIENT else None
+            if retry_in is not None:
+                # Journal only: the results file gets the final outcome
+                self._print(f"   ⚠️  Failed ({error_class}): {error_msg} - retrying in {retry_in:.0f}s\n")
+                self.metrics.record_outcome(f"retry_{error_class}")
+                self.journal.record(number, f"Error (will retry): {error_msg}", attempts=attempts,
+                                    error_class=error_class)
+            else:
+                self._print(f"   ❌ Failed ({error_class}): {error_msg}\n")
+                self.record_result(number, f"Error: {error_msg}", attempts, error_class=error_class)
+                self.metrics.record_outcome(f"error_{error_class}")
+                self.failed_count += 1
+
+    def count_sent(self, number, attempts):
+        if self.contact_index is not None:
+            self.contact_index.mark_sent(number)
+        self.pacer.record_sent()
+        self.success_count += 1
+        if attempts > 1:
+            self.retry_queue.recovered += 1
+
+    def summary(self):
+        lines = self.transport.summary()
+        phase_medians = [(phase, self.metrics.histograms[phase].quantile(0.5))
+                         for phase in PHASES if phase in self.metrics.histograms]
+        if phase_medians:
+            lines.append("⏱️  Median per phase: "
+                         + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in phase_medians))
+        if self.retry_queue.retried:
+            lines.append(f"🔄 Retries: {self.retry_queue.retried} queued, "
+                         f"{self.retry_queue.recovered} succeeded on retry")
+        if self.pacer.deferred:
+            lines.append(f"🌙 Deferred to their send window: {self.pacer.deferred}")
+        lines.append(f"⏳ Paced waiting: {self.pacer.waited_seconds / 60:.0f} min")
+        return lines
@@ -0,0 +1,299 @@
+import os
+import shutil
+import threading
+import time
+
+from selenium.common.exceptions import (
+    InvalidSessionIdException, NoSuchWindowException, WebDriverException,
+)
+from urllib3.exceptions import MaxRetryError, ProtocolError
+
+import browser
+import whatsapp_web
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# === Browser supervisor ===
+# Owns the driver. Liveness is checked passively - is the chromedriver
+# process still running, does it still have a Chrome child (needs psutil) -
+# so a healthy run pays no WebDriver round trip for it. When a session dies,
+# either before a contact or as a connection error in the middle of one,
+# Chrome is restarted on the same profile, WhatsApp Web readiness is checked
+# again and the interrupted contact is retried once - unless ENTER had
+# already been pressed (SentUnconfirmed), which is never retried. With a hot
+# standby the restart skips the Chrome launch: a second, already started
+# browser loads WhatsApp Web in its place.
+#
+# If the saved session expires mid-run (the QR code shows up instead of the
+# chat), WhatsApp Web is reloaded and waits for a new login - the QR code is
+# saved to qr_screenshot in headless mode - and the contact is retried. With
+# no login within login_timeout, LoggedOut ends the run.
+#
+# Long runs also slow down as the WhatsApp tab's JS heap and DOM grow. Every
+# `memory_check_every` contacts the tab is sampled, and past either threshold
+# it is recycled between two contacts: "tab" replaces just the tab, "session"
+# restarts Chrome on the same profile. The login is kept either way.
+
+DEAD_SESSION_MESSAGES = (
+    "chrome not reachable",
+    "invalid session id",
+    "session deleted",
+    "disconnected",
+    "target window already closed",
+    "no such window",
+    "connection refused",
+    "tab crashed",             # renderer died, e.g. out of memory under the lean heap cap
+    "page crash",
+)
+
+
+def is_dead_session_error(error):
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException,
+                          MaxRetryError, ProtocolError, ConnectionError)):
+        return True
+    if isinstance(error, WebDriverException):
+        message = str(error).lower()
+        return any(text in message for text in DEAD_SESSION_MESSAGES)
+    return False
+
+
+def driver_alive(driver):
+    if driver is None:
+        return False
+    process = getattr(driver.service, "process", None)
+    if process is None or process.poll() is not None:
+        return False
+    if psutil is None:
+        return True
+    try:
+        return any(child.status() != psutil.STATUS_ZOMBIE
+                   for child in psutil.Process(process.pid).children())
+    except psutil.Error:
+        return False
+
+
+# Chrome refuses to share a user-data-dir, so the standby gets a copy
+# (without locks and caches) of the logged-in profile
+PROFILE_COPY_IGNORE = shutil.ignore_patterns(
+    "Singleton*", "lockfile", "Cache", "Code Cache", "GPUCache", "Crashpad",
+)
+
+
+def copy_profile(source, target):
+    if not source or not os.path.isdir(source):
+        return
+    shutil.rmtree(target, ignore_errors=True)
+    shutil.copytree(source, target, ignore=PROFILE_COPY_IGNORE)
+
+
+class BrowserSupervisor:
+    # With hot_standby, a second Chrome on a copy of the profile is started
+    # in the background and parked on about:blank. It must not load WhatsApp
+    # Web while the primary is connected: both would be the same linked
+    # device, and one would take the connection from the other. When the
+    # primary dies it is quit, the standby opens WhatsApp Web (readiness
+    # checked as for any restart), the two profile folders swap roles and a
+    # new standby starts in the background on the dead primary's profile.
+    def __init__(self, profile_dir, hot_standby=False, standby_profile_dir=None,
+                 memory_check_every=0, max_js_heap_mb=None, max_dom_nodes=None, recycle_mode="tab"):
+        self.profile_dir = profile_dir
+        self.spare_profile_dir = standby_profile_dir
+        self.hot_standby = hot_standby and bool(profile_dir) and bool(standby_profile_dir)
+        self.driver = None
+        self.standby = None
+        self._warming = False
+        self._standby_lock = threading.Lock()
+        self.restarts = 0
+        self.restart_seconds = 0.0
+        self.failovers = 0
+        self.failover_seconds = 0.0
+        self.relogins = 0
+        self.memory_check_every = memory_check_every
+        self.max_js_heap_mb = max_js_heap_mb
+        self.max_dom_nodes = max_dom_nodes
+        self.recycle_mode = recycle_mode
+        self.tasks_since_check = 0
+        self.last_metrics = None
+        self.recycles = 0
+        self.recycle_seconds = 0.0
+
+    def _launch(self, profile_dir):
+        driver = browser.start_chrome(browser.build_options(profile_dir))
+        return driver, browser.open_whatsapp(driver)
+
+    # Starts Chrome and waits for WhatsApp Web ("session" or "qr", see
+    # browser.open_whatsapp)
+    def start(self):
+        if self.hot_standby:
+            # Copy while the profile is at rest, before the primary starts
+            copy_profile(self.profile_dir, self.spare_profile_dir)
+        self.driver, login = self._launch(self.profile_dir)
+        if self.hot_standby:
+            self._warm_standby_async()
+        return login
+
+    def is_alive(self):
+        return driver_alive(self.driver)
+
+    def _warm_standby(self, profile_dir):
+        driver = None
+        try:
+            driver = browser.start_chrome(browser.build_options(profile_dir))
+            driver.get("about:blank")
+        except Exception as error:
+            print(f"   ⚠️  Standby browser failed to start: {str(error)[:100]}")
+            self._quit(driver)
+            driver = None
+        with self._standby_lock:
+            self.standby = driver
+            self._warming = False
+
+    def _warm_standby_async(self):
+        with self._standby_lock:
+            if self._warming or self.standby is not None:
+                return
+            self._warming = True
+        threading.Thread(target=self._warm_standby, args=(self.spare_profile_dir,), daemon=True).start()
+
+    def _take_standby(self):
+        with self._standby_lock:
+            standby, self.standby = self.standby, None
+        if driver_alive(standby):
+            return standby
+        self._quit(standby)
+        return None
+
+    # Quits the dead primary first (one WhatsApp Web client at a time), then
+    # has the standby load WhatsApp. Returns the login state, or None if the
+    # standby couldn't take over.
+    def _failover(self, standby):
+        started = time.time()
+        self._quit(self.driver)
+        self.driver = standby
+        self.profile_dir, self.spare_profile_dir = self.spare_profile_dir, self.profile_dir
+        try:
+            login = browser.open_whatsapp(standby)
+        except Exception as error:
+            print(f"   ⚠️  Standby browser failed to load WhatsApp Web: {str(error)[:100]}")
+            return None
+        elapsed = time.time() - started
+        self.failovers += 1
+        self.failover_seconds += elapsed
+        print(f"   🔀 Switched to the standby browser in {elapsed:.1f}s")
+        self._warm_standby_async()
+        return login
+
+    def restart(self):
+        standby = self._take_standby() if self.hot_standby else None
+        if standby is not None:
+            login = self._failover(standby)
+            if login is not None:
+                return login
+
+        started = time.time()
+        self._quit(self.driver)
+        self.driver = None
+        self.driver, login = self._launch(self.profile_dir)
+        elapsed = time.time() - started
+        self.restarts += 1
+        self.restart_seconds += elapsed
+        print(f"   🔁 Browser restarted in {elapsed:.1f}s")
+        if self.hot_standby:
+            self._warm_standby_async()
+        return login
+
+    def relogin(self):
+        print("   🔐 WhatsApp Web session expired - log in again to continue...")
+        started = time.time()
+        try:
+            browser.open_whatsapp(self.driver)
+        except Exception as error:
+            raise whatsapp_web.LoggedOut(
+                "Logged out of WhatsApp Web and no new login within login_timeout"
+            ) from error
+        self.relogins += 1
+        print(f"   ✅ Logged in again after {time.time() - started:.0f}s")
+
+    # Returns the threshold that was crossed ("js_heap" / "dom_nodes") or None
+    def _over_threshold(self, metrics):
+        heap, nodes = metrics.get("js_heap_mb"), metrics.get("dom_nodes")
+        if self.max_js_heap_mb and heap is not None and heap > self.max_js_heap_mb:
+            return "js_heap"
+        if self.max_dom_nodes and nodes is not None and nodes > self.max_dom_nodes:
+            return "dom_nodes"
+        return None
+
+    def recycle(self, mode=None):
+        mode = mode or self.recycle_mode
+        started = time.time()
+        if mode == "tab":
+            login = browser.recycle_tab(self.driver)
+        else:
+            self._quit(self.driver)
+            self.driver = None
+            self.driver, login = self._launch(self.profile_dir)
+        elapsed = time.time() - started
+        self.recycles += 1
+        self.recycle_seconds += elapsed
+        print(f"   ♻️  Recycled the WhatsApp {mode} in {elapsed:.1f}s")
+        return login
+
+    def check_memory(self):
+        self.tasks_since_check = 0
+        try:
+            self.last_metrics = browser.page_metrics(self.driver)
+        except Exception:
+            return  # sampling is best effort; a dead browser is handled in run()
+        crossed = self._over_threshold(self.last_metrics)
+        if crossed:
+            print(f"   🧠 JS heap {self.last_metrics['js_heap_mb'] or 0:.0f} MB, "
+                  f"{self.last_metrics['dom_nodes'] or 0:.0f} DOM nodes ({crossed} limit)")
+            try:
+                self.recycle()
+            except Exception as error:
+                if not is_dead_session_error(error) and self.is_alive():
+                    raise
+                # Left for the liveness check in run() to restart
+
+    # Runs task(driver); a dead browser is restarted and the task retried once
+    def run(self, task):
+        if self.memory_check_every and self.tasks_since_check >= self.memory_check_every:
+            self.check_memory()
+        self.tasks_since_check += 1
+
+        if not self.is_alive():
+            print("   ❌ Browser is gone! Restarting...")
+            self.restart()
+
+        try:
+            return task(self.driver)
+        except whatsapp_web.SentUnconfirmed:
+            # ENTER already went out - running the task again could send the
+            # message twice. A dead browser is restarted before the next task.
+            raise
+        except whatsapp_web.LoggedOut:
+            self.relogin()
+            return task(self.driver)
+        except Exception as error:
+            if not is_dead_session_error(error) and self.is_alive():
+                raise
+            print("   ❌ Browser crashed! Restarting...")
+            self.restart()
+            return task(self.driver)
+
+    def _quit(self, driver):
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def quit(self):
+        self._quit(self.driver)
+        self.driver = None
+        with self._standby_lock:
+            standby, self.standby = self.standby, None
+        self._quit(standby)
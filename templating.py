@@ -0,0 +1,116 @@
+import re
+
+import pandas as pd
+
+# === Message templates ===
+# The message is read from a text file and compiled once into literal text
+# and placeholders. Placeholders name a column of the contact file:
+#
+#   Hi {name|there}, how is {company}?
+#
+# `|` gives a default for rows where the column is empty or missing;
+# `{{` and `}}` are literal braces. Column names are matched the way
+# contacts.py stores them (stripped, lower case).
+#
+# Rendering works on a whole chunk of contacts at once (string ops on the
+# columns, no per-row Python), during ingestion, so by the time a contact
+# reaches the browser its message is already there.
+
+PLACEHOLDER = re.compile(r"\{\{|\}\}|\{([^{}|]+)(?:\|([^{}]*))?\}")
+
+# Values come from a spreadsheet: no line breaks or control characters (they
+# would reshape the message), and WhatsApp's formatting markers get a zero
+# width space so a stray * or _ in a name can't bold or italicise the text
+# around it
+CONTROL_CHARS = r"[\x00-\x08\x0b-\x1f\x7f]"
+FORMATTING_MARKERS = r"([*_~`])"
+ZERO_WIDTH_SPACE = "\u200b"
+
+
+class TemplateError(ValueError):
+    pass
+
+
+def escape_values(values):
+    values = values.str.replace(CONTROL_CHARS, "", regex=True)
+    values = values.str.replace(r"\s+", " ", regex=True).str.strip()
+    return values.str.replace(FORMATTING_MARKERS, r"\1" + ZERO_WIDTH_SPACE, regex=True)
+
+
+class MessageTemplate:
+    def __init__(self, text, escape=True):
+        self.text = text
+        self.escape = escape
+        self.parts = []      # literal strings and (column, default) tuples
+        self.fields = []
+        literal = []
+        position = 0
+        for match in PLACEHOLDER.finditer(text):
+            literal.append(self._literal(text[position:match.start()]))
+            position = match.end()
+            token = match.group(0)
+            if token in ("{{", "}}"):
+                literal.append(token[0])
+                continue
+            if literal:
+                self.parts.append("".join(literal))
+                literal = []
+            column = match.group(1).strip().lower()
+            self.parts.append((column, match.group(2)))
+            if column not in self.fields:
+                self.fields.append(column)
+        literal.append(self._literal(text[position:]))
+        if "".join(literal):
+            self.parts.append("".join(literal))
+
+    @staticmethod
+    def _literal(text):
+        if "{" in text or "}" in text:
+            raise TemplateError(f"Unbalanced brace in the message template near '{text[-20:]}' "
+                                "(use {{ and }} for literal braces)")
+        return text
+
+    @classmethod
+    def from_file(cls, path, escape=True):
+        with open(path, encoding="utf-8-sig") as f:
+            return cls(f.read().strip(), escape)
+
+    @property
+    def is_static(self):
+        return not self.fields
+
+    # Placeholders without a default must exist as columns
+    def check_columns(self, columns):
+        columns = set(columns)
+        missing = []
+        for part in self.parts:
+            if isinstance(part, tuple) and part[1] is None and part[0] not in columns | set(missing):
+                missing.append(part[0])
+        if missing:
+            raise TemplateError(
+                f"Template placeholders without a default have no column in the file: {', '.join(missing)}"
+            )
+
+    # One message per row of the chunk (Series aligned with its index)
+    def render_chunk(self, chunk):
+        rendered = pd.Series("", index=chunk.index, dtype=object)
+        for part in self.parts:
+            if isinstance(part, str):
+                rendered = rendered + part
+                continue
+            column, default = part
+            if column in chunk.columns:
+                values = chunk[column]
+                values = values.where(values.notna(), "").astype(str)
+                values = values.where(~values.str.strip().str.lower().isin(["", "nan", "none"]), "")
+                if self.escape:
+                    values = escape_values(values)
+            else:
+                values = pd.Series("", index=chunk.index, dtype=object)
+            if default is not None:
+                values = values.where(values != "", default)
+            rendered = rendered + values
+        return rendered
+
+    def render(self, row):
+        return self.render_chunk(pd.DataFrame([row])).iloc[0]
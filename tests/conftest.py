@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pacing
+
+
+# Stands in for the time module in pacing.py: time() reads the fake clock
+# and sleep() moves it forward instantly
+class FakeClock:
+    def __init__(self, start=1_700_000_000.0):
+        self.now = start
+        self.slept = 0.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.slept += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(pacing, "time", fake)
+    return fake
@@ -0,0 +1,70 @@
+import time
+
+import contact_index
+from contact_index import ContactIndex, CACHED_INVALID, ALREADY_SENT, SUPPRESSED
+
+DAY = 86400
+NUMBER = "+919800000001"
+
+
+class Clock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def strftime(self, fmt):
+        return time.strftime(fmt, time.localtime(self.now))
+
+
+def open_index(tmp_path, monkeypatch, **kwargs):
+    clock = Clock()
+    monkeypatch.setattr(contact_index, "time", clock)
+    return ContactIndex(str(tmp_path / "index.sqlite"), campaign="test", **kwargs), clock
+
+
+def test_invalid_verdict_is_cached_until_the_ttl(tmp_path, monkeypatch):
+    index, clock = open_index(tmp_path, monkeypatch, invalid_ttl=30 * DAY)
+    index.mark_invalid(NUMBER)
+    clock.now += 30 * DAY - 1
+    assert index.known([NUMBER]) == {NUMBER: CACHED_INVALID}
+    clock.now += 2
+    assert index.known([NUMBER]) == {}
+    assert (index.invalid_lookups, index.invalid_hits) == (2, 1)
+
+
+def test_invalid_verdict_without_ttl_never_expires(tmp_path, monkeypatch):
+    index, clock = open_index(tmp_path, monkeypatch)
+    index.mark_invalid(NUMBER)
+    clock.now += 3650 * DAY
+    assert index.known([NUMBER]) == {NUMBER: CACHED_INVALID}
+
+
+def test_recheck_invalid_lets_cached_numbers_through(tmp_path, monkeypatch):
+    index, _ = open_index(tmp_path, monkeypatch, skip_invalid=False)
+    index.mark_invalid(NUMBER)
+    assert index.known([NUMBER]) == {}
+
+
+def test_a_new_verdict_restarts_the_ttl(tmp_path, monkeypatch):
+    index, clock = open_index(tmp_path, monkeypatch, invalid_ttl=DAY)
+    index.mark_invalid(NUMBER)
+    clock.now += DAY - 10
+    index.mark_invalid(NUMBER)
+    clock.now += DAY - 10
+    assert index.known([NUMBER]) == {NUMBER: CACHED_INVALID}
+
+
+def test_a_successful_send_clears_the_invalid_verdict(tmp_path, monkeypatch):
+    index, _ = open_index(tmp_path, monkeypatch)
+    index.mark_invalid(NUMBER)
+    index.mark_sent(NUMBER)
+    assert index.known([NUMBER]) == {NUMBER: ALREADY_SENT}
+
+
+def test_suppression_wins_over_the_other_verdicts(tmp_path, monkeypatch):
+    index, _ = open_index(tmp_path, monkeypatch)
+    index.mark_invalid(NUMBER)
+    index.suppress([NUMBER])
+    assert index.known([NUMBER]) == {NUMBER: SUPPRESSED}
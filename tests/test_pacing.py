@@ -0,0 +1,83 @@
+import pytest
+
+import pacing
+from fake_transport import FakeTransport
+from journal import SendJournal
+from metrics import PhaseMetrics
+from pacing import PacingScheduler, HOUR
+from result_sinks import open_sink
+from retries import RetryQueue
+from sender import Sender
+
+
+def send_times(pacer, clock, count, contacts=None):
+    times = []
+    for _ in pacer.schedule(contacts or [{}] * count):
+        times.append(clock.now)
+        pacer.record_sent()
+    return [ts - times[0] for ts in times]
+
+
+def test_rate_spaces_sends_by_the_interval(clock):
+    pacer = PacingScheduler(max_per_minute=6)
+    assert send_times(pacer, clock, 4) == [0, 10, 20, 30]
+
+
+def test_burst_sends_back_to_back_then_refills(clock):
+    pacer = PacingScheduler(max_per_minute=6, burst=3)
+    assert send_times(pacer, clock, 5) == [0, 0, 0, 10, 20]
+
+
+def test_hourly_cap_waits_for_the_oldest_send_to_age_out(clock):
+    pacer = PacingScheduler(max_per_minute=60, hourly_cap=3)
+    assert send_times(pacer, clock, 5) == [0, 1, 2, HOUR, HOUR + 1]
+
+
+def test_daily_cap_moves_to_the_next_day(clock):
+    pacer = PacingScheduler(max_per_minute=60, daily_cap=2, timezone="UTC")
+    times = send_times(pacer, clock, 3)
+    start = clock.now - times[-1]
+    assert times[:2] == [0, 1]
+    assert pacer._day(start + times[2]) != pacer._day(start)
+
+
+def test_seeded_sends_count_towards_the_caps(clock):
+    pacer = PacingScheduler(max_per_minute=60, hourly_cap=2)
+    pacer.seed([clock.now - 600, clock.now - 300])
+    started = clock.now
+    next(iter(pacer.schedule([{}])))
+    assert clock.now - started == HOUR - 600
+
+
+def test_refunded_tokens_are_not_paced(clock):
+    pacer = PacingScheduler(max_per_minute=6)
+    for _ in pacer.schedule([{}] * 5):
+        pacer.refund()
+    assert clock.slept == 0
+
+
+def test_send_window_defers_contacts_outside_it(clock):
+    # Fake clock starts at 22:13 UTC
+    pacer = PacingScheduler(max_per_minute=60, window=("09:00", "17:00"), timezone="UTC")
+    for _ in pacer.schedule([{}]):
+        pass
+    assert pacer.deferred == 1
+    assert pacing.datetime.datetime.fromtimestamp(clock.now, pacer.timezone).strftime("%H:%M") == "09:00"
+
+
+def test_only_real_sends_are_paced(clock, tmp_path):
+    numbers = [f"+91980000001{i}" for i in range(4)]
+    script = dict.fromkeys(numbers[:2], "invalid")
+    script.update(dict.fromkeys(numbers[2:], "success"))
+    metrics = PhaseMetrics()
+    transport = FakeTransport(metrics, invalid_rate=0, script=script, time_scale=0)
+    journal = SendJournal(str(tmp_path / "journal.jsonl"), "test")
+    results_sink = open_sink(str(tmp_path / "results.csv"))
+    sender = Sender(transport, PacingScheduler(max_per_minute=6, burst=1), RetryQueue(), metrics,
+                    journal, results_sink, verbose=False)
+    sender.run({"number": number, "message": "Hello"} for number in numbers)
+    journal.close()
+    results_sink.close()
+    # The two invalid numbers hand their tokens back; the second send waits
+    assert clock.slept == pytest.approx(10)
+    assert sender.success_count == 2
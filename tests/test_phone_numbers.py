@@ -0,0 +1,76 @@
+import pytest
+
+from phone_numbers import (
+    normalize_numbers, OK, OK_NATIONAL, EMPTY, NOT_A_NUMBER, UNKNOWN_COUNTRY, TOO_SHORT, TOO_LONG,
+)
+
+
+def normalize(value, region="IN"):
+    row = normalize_numbers([value], region).iloc[0]
+    return row["number"], row["reason"]
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("+91 98765 43210", "+919876543210"),
+    ("+1 (415) 555-0123", "+14155550123"),
+    ("+44 7911 123456", "+447911123456"),
+])
+def test_international_numbers(value, expected):
+    assert normalize(value) == (expected, OK)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("+420 601 123 456", "+420601123456"),   # CZ
+    ("+886 912 345 678", "+886912345678"),   # TW
+    ("+593 99 123 4567", "+593991234567"),   # EC
+    ("+359 888 123 456", "+359888123456"),   # BG
+    ("+352 621 123 456", "+352621123456"),   # LU
+    ("+263 77 123 4567", "+263771234567"),   # ZW
+])
+def test_calling_codes_missing_from_the_table_are_kept(value, expected):
+    assert normalize(value) == (expected, OK)
+
+
+def test_unlisted_calling_code_needs_a_plausible_length():
+    assert normalize("+420 601") == ("", UNKNOWN_COUNTRY)
+    assert normalize("+420 6011 2345 6789 01") == ("", UNKNOWN_COUNTRY)
+
+
+@pytest.mark.parametrize("value", ["9.19876543210E+11", "919876543210.0", 919876543210.0, 919876543210])
+def test_excel_float_artifacts(value):
+    assert normalize(value) == ("+919876543210", OK)
+
+
+def test_national_number_gets_the_default_region():
+    assert normalize("98765 43210") == ("+919876543210", OK_NATIONAL)
+    assert normalize("(415) 555-0123", "US") == ("+14155550123", OK_NATIONAL)
+
+
+@pytest.mark.parametrize("value", ["09876543210", "+91 09876543210"])
+def test_trunk_zero_is_dropped_when_it_fixes_the_length(value):
+    assert normalize(value)[0] == "+919876543210"
+
+
+@pytest.mark.parametrize("value", ["0091 98765 43210", "00420 601 123 456"])
+def test_00_prefix_means_international(value):
+    number, reason = normalize(value)
+    assert reason == OK
+    assert number == "+" + value.replace(" ", "")[2:]
+
+
+@pytest.mark.parametrize("value, reason", [
+    ("", EMPTY),
+    (None, EMPTY),
+    ("nan", EMPTY),
+    ("call me", NOT_A_NUMBER),
+    ("12345", TOO_SHORT),
+    ("+91 98765", TOO_SHORT),
+    ("+91 98765 43210 123", TOO_LONG),
+])
+def test_unusable_numbers_get_a_reason(value, reason):
+    assert normalize(value) == ("", reason)
+
+
+def test_unknown_default_region_is_an_error():
+    with pytest.raises(ValueError):
+        normalize_numbers(["98765 43210"], "XX")
@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+from result_sinks import open_sink
+
+EXTENSIONS = [".csv", ".jsonl", ".parquet", ".xlsx"]
+
+
+def write(path, numbers, append=False):
+    sink = open_sink(path, flush_every=1, append=append)
+    for number in numbers:
+        sink.write({"number": number, "status": "Success", "attempts": 1})
+    sink.close()
+
+
+def read(path):
+    if path.endswith(".csv"):
+        return pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+    if path.endswith(".jsonl"):
+        return pd.read_json(path, lines=True, dtype=str)
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_excel(path, dtype=str)
+
+
+@pytest.fixture(params=EXTENSIONS)
+def path(request, tmp_path):
+    if request.param == ".parquet":
+        pytest.importorskip("pyarrow")
+    return str(tmp_path / f"results{request.param}")
+
+
+def test_resume_keeps_the_rows_of_the_earlier_run(path):
+    write(path, ["+919800000001", "+919800000002"])
+    write(path, ["+919800000003"], append=True)
+    results = read(path)
+    assert list(results["number"]) == ["+919800000001", "+919800000002", "+919800000003"]
+    assert list(results["status"]) == ["Success"] * 3
+
+
+def test_without_resume_the_file_starts_over(path):
+    write(path, ["+919800000001", "+919800000002"])
+    write(path, ["+919800000003"])
+    assert list(read(path)["number"]) == ["+919800000003"]
+
+
+def test_resume_without_an_earlier_file_writes_a_new_one(path):
+    write(path, ["+919800000001"], append=True)
+    assert list(read(path)["number"]) == ["+919800000001"]
+
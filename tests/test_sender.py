@@ -0,0 +1,140 @@
+import csv
+
+import pandas as pd
+import pytest
+
+from contacts import iter_contacts
+from fake_transport import FakeTransport
+from journal import SendJournal, completed_numbers, read_journal
+from metrics import PhaseMetrics
+from pacing import PacingScheduler
+from result_sinks import open_sink
+from retries import RetryQueue
+from sender import Sender
+from transport import SUCCESS, INVALID, LoggedOut
+
+SCRIPT = {
+    "+919800000001": "success",
+    "+919800000002": "invalid",
+    "+919800000003": "timeout",
+    "+919800000004": "crash",
+    "+919800000005": "unconfirmed",
+}
+
+
+class Run:
+    def __init__(self, workdir, script, max_attempts=3, max_per_minute=10**9, burst=10**6,
+                 transport_class=FakeTransport):
+        self.journal_path = str(workdir / "journal.jsonl")
+        self.results_path = str(workdir / "results.csv")
+        self.metrics = PhaseMetrics()
+        self.transport = transport_class(self.metrics, invalid_rate=0, script=script, time_scale=0)
+        self.journal = SendJournal(self.journal_path, "test")
+        self.results_sink = open_sink(self.results_path, flush_every=1)
+        self.retry_queue = RetryQueue(max_attempts, base_delay=0, max_delay=0)
+        self.pacer = PacingScheduler(max_per_minute, burst)
+        self.sender = Sender(self.transport, self.pacer, self.retry_queue, self.metrics, self.journal,
+                             self.results_sink, verbose=False)
+
+    def send(self, numbers):
+        self.sender.run({"number": number, "message": "Hello"} for number in numbers)
+        self.journal.close()
+        self.results_sink.close()
+        return self
+
+    def results(self):
+        with open(self.results_path, encoding="utf-8-sig", newline="") as f:
+            return {row["number"]: row for row in csv.DictReader(f)}
+
+    def journal_entries(self, number):
+        return [entry for entry in read_journal(self.journal_path) if entry["number"] == number]
+
+
+@pytest.fixture
+def run(tmp_path):
+    return Run(tmp_path, SCRIPT).send(list(SCRIPT))
+
+
+def test_every_contact_gets_one_final_result(run):
+    results = run.results()
+    assert list(results) == list(SCRIPT)
+    assert results["+919800000001"]["status"] == SUCCESS
+    assert results["+919800000002"]["status"] == INVALID
+    assert results["+919800000003"]["status"].startswith("Error")
+    assert results["+919800000004"]["status"].startswith("Error")
+    assert run.sender.success_count == 2
+    assert run.sender.failed_count == 3
+
+
+def test_transient_failures_use_every_attempt(run):
+    results = run.results()
+    assert results["+919800000003"]["attempts"] == "3"
+    assert results["+919800000004"]["attempts"] == "3"
+    assert run.retry_queue.retried == 4
+    assert run.transport.sends == 9   # 1 + 1 + 3 + 3 + 1
+    assert [entry["status"].startswith("Error (will retry)")
+            for entry in run.journal_entries("+919800000003")] == [True, True, False]
+
+
+def test_invalid_numbers_are_not_retried(run):
+    assert len(run.journal_entries("+919800000002")) == 1
+    assert run.results()["+919800000002"]["attempts"] == "1"
+
+
+def test_unconfirmed_send_is_recorded_as_sent_and_never_retried(run):
+    result = run.results()["+919800000005"]
+    assert result["status"] == SUCCESS
+    assert result["delivery"] == "unconfirmed"
+    entries = run.journal_entries("+919800000005")
+    assert len(entries) == 1
+    assert entries[0]["delivery"] == "unconfirmed"
+
+
+def test_retry_that_succeeds_counts_as_recovered(tmp_path):
+    class FlakyTransport(FakeTransport):
+        failed = set()
+
+        def _outcome(self, number):
+            if number not in self.failed:
+                self.failed.add(number)
+                return "timeout"
+            return "success"
+
+    run = Run(tmp_path, {}, transport_class=FlakyTransport).send(["+919800000001"])
+    assert run.results()["+919800000001"]["attempts"] == "2"
+    assert run.retry_queue.recovered == 1
+    assert run.sender.success_count == 1
+
+
+def test_resume_skips_completed_contacts(run, tmp_path):
+    done = completed_numbers(run.journal_path, "test")
+    assert done == {"+919800000001", "+919800000002", "+919800000005"}
+
+    contacts_path = tmp_path / "contacts.csv"
+    pd.DataFrame({"number": list(SCRIPT)}).to_csv(contacts_path, index=False)
+    skipped = {}
+    remaining = [row["number"] for row in iter_contacts(str(contacts_path), stats=skipped, done=done)]
+    assert remaining == ["+919800000003", "+919800000004"]
+    assert sum(skipped.values()) == 3
+
+
+def test_logged_out_stops_the_run_without_recording_the_contact(tmp_path):
+    script = {"+919800000001": "success", "+919800000002": "logged_out", "+919800000003": "success"}
+    run = Run(tmp_path, script)
+    with pytest.raises(LoggedOut):
+        run.send(list(script))
+    run.journal.close()
+    run.results_sink.close()
+    assert list(run.results()) == ["+919800000001"]
+    assert completed_numbers(run.journal_path, "test") == {"+919800000001"}
+    assert run.sender.failed_count == 0
+
+
+def test_journal_entry_after_a_torn_line_is_kept(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"campaign": "test", "number": "+919800000001", "status": "Success"}\n{"campaign": "te')
+    journal = SendJournal(path, "test")
+    journal.record("+919800000002", SUCCESS)
+    journal.close()
+    assert completed_numbers(path, "test") == {"+919800000001", "+919800000002"}
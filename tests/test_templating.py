@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from templating import MessageTemplate, TemplateError, escape_values, ZERO_WIDTH_SPACE
+
+
+def test_placeholders_are_filled_per_row():
+    template = MessageTemplate("Hi {name}, your order from {Company} is ready.")
+    chunk = pd.DataFrame({"name": ["Asha", "Ravi"], "company": ["Acme", "Globex"]})
+    assert list(template.render_chunk(chunk)) == [
+        "Hi Asha, your order from Acme is ready.",
+        "Hi Ravi, your order from Globex is ready.",
+    ]
+    assert template.fields == ["name", "company"]
+
+
+@pytest.mark.parametrize("name", ["", None, "nan", "  "])
+def test_default_is_used_for_empty_values(name):
+    assert MessageTemplate("Hi {name|there}!").render({"name": name}) == "Hi there!"
+
+
+def test_default_covers_a_missing_column():
+    template = MessageTemplate("Hi {name|there}!")
+    template.check_columns(["number"])
+    assert template.render({"number": "+919800000001"}) == "Hi there!"
+
+
+def test_placeholder_without_default_needs_its_column():
+    with pytest.raises(TemplateError, match="name"):
+        MessageTemplate("Hi {name}!").check_columns(["number"])
+
+
+def test_double_braces_are_literal():
+    template = MessageTemplate("Use code {{SAVE10}} at {shop}")
+    assert template.render({"shop": "Acme"}) == "Use code {SAVE10} at Acme"
+
+
+@pytest.mark.parametrize("text", ["Hi {name", "Hi name}"])
+def test_unbalanced_braces_are_an_error(text):
+    with pytest.raises(TemplateError):
+        MessageTemplate(text)
+
+
+def test_static_template():
+    template = MessageTemplate("Hello!")
+    assert template.is_static
+    assert template.render({}) == "Hello!"
+
+
+def test_values_cannot_reshape_the_message():
+    values = escape_values(pd.Series(["Asha\nKumar", "Ra\x07vi\t ", "*bold* _it_"]))
+    assert list(values) == [
+        "Asha Kumar",
+        "Ravi",
+        f"*{ZERO_WIDTH_SPACE}bold*{ZERO_WIDTH_SPACE} _{ZERO_WIDTH_SPACE}it_{ZERO_WIDTH_SPACE}",
+    ]
+
+
+def test_escaping_applies_to_values_not_the_template():
+    row = {"name": "*Asha*"}
+    assert MessageTemplate("*Hi* {name}").render(row) == f"*Hi* *{ZERO_WIDTH_SPACE}Asha*{ZERO_WIDTH_SPACE}"
+    assert MessageTemplate("*Hi* {name}", escape=False).render(row) == "*Hi* *Asha*"
@@ -0,0 +1,29 @@
+import pytest
+
+from whatsapp_web import composer_matches
+
+
+class Driver:
+    def __init__(self, text):
+        self.text = text
+
+    def execute_script(self, script, *args):
+        return self.text
+
+
+@pytest.mark.parametrize("text", [
+    "Hi Asha,\nYour order is ready.",
+    "Hi  Asha,\u00a0\nYour order is ready. \n",
+    "\nHi Asha,\nYour order is ready.",
+])
+def test_composer_matches_line_by_line(text):
+    assert composer_matches(Driver(text), None, "Hi Asha,\nYour order is ready.")
+
+
+@pytest.mark.parametrize("text", [
+    "Hi Asha,Your order is ready.",
+    "Hi Asha,\n\nYour order is ready.",
+    "Hi Asha,\nYour order is ready",
+])
+def test_composer_mismatch_on_line_breaks_or_text(text):
+    assert not composer_matches(Driver(text), None, "Hi Asha,\nYour order is ready.")
@@ -0,0 +1,156 @@
+import time
+
+from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import TimeoutException
+
+import whatsapp_web
+from whatsapp_web import SentUnconfirmed, LoggedOut
+
+# === Messaging transports ===
+# The send loop (sender.py) only talks to a transport: start it, hand it one
+# (number, message) at a time, quit it. send() returns SUCCESS or INVALID
+# and raises on anything else; the loop classifies and retries the errors,
+# except SentUnconfirmed (ENTER went out, the bubble never showed), which
+# is recorded as sent and never tried again, and LoggedOut, which stops the
+# run without recording anything against the contact.
+# A transport that tracks delivery reports each SUCCESS again later through
+# delivery_updates() once its ticks have resolved.
+# WhatsAppWebTransport drives Chrome through the supervisor; FakeTransport
+# (fake_transport.py) simulates one for offline runs and benchmarks.
+
+SUCCESS = "Success"
+INVALID = "Invalid/Not on WhatsApp"
+
+
+class MessagingTransport:
+    def start(self):
+        return "session"
+
+    def send(self, number, message):
+        raise NotImplementedError
+
+    tracks_delivery = False
+
+    # [(number, delivery status, seconds)] resolved since the last call;
+    # final=True resolves everything still pending
+    def delivery_updates(self, final=False):
+        return []
+
+    # Extra lines for the run summary
+    def summary(self):
+        return []
+
+    def quit(self):
+        pass
+
+
+class WhatsAppWebTransport(MessagingTransport):
+    def __init__(self, supervisor, selector_registry, metrics, delivery=None, delivery_final_wait=0):
+        self.supervisor = supervisor
+        self.selector_registry = selector_registry
+        self.metrics = metrics
+        self.delivery = delivery
+        self.delivery_final_wait = delivery_final_wait
+        self.route_counts = {"in_app": 0, "url": 0}
+
+    @property
+    def tracks_delivery(self):
+        return self.delivery is not None
+
+    # "session" or "qr", see browser.open_whatsapp
+    def start(self):
+        return self.supervisor.start()
+
+    # The supervisor restarts a dead browser and retries the contact once
+    def send(self, number, message):
+        return self.supervisor.run(lambda driver: self._send(driver, number, message))
+
+    # One contact on a live browser
+    def _send(self, driver, number, message):
+        metrics = self.metrics
+        if self.delivery is not None:
+            self.delivery.poll(driver)
+
+        # Open the chat inside the loaded app when possible, else via the URL
+        with metrics.span("navigate"):
+            route = whatsapp_web.open_chat(driver, number)
+        self.route_counts[route] += 1
+
+        # Probe the page until it shows the invalid-number alert or the message box
+        selectors = self.selector_registry.ordered()
+        probe_started = time.time()
+        with metrics.span("classify"):
+            state, message_box, matched = whatsapp_web.wait_for_page_state(driver, selectors=selectors)
+        if state in (whatsapp_web.COMPOSER, whatsapp_web.LOADING):
+            self.selector_registry.record(selectors, matched, time.time() - probe_started)
+
+        if state == whatsapp_web.INVALID:
+            print(f"   ❌ Invalid/Not on WhatsApp\n")
+            return INVALID
+
+        if state == whatsapp_web.LOGGED_OUT:
+            raise LoggedOut("Logged out of WhatsApp Web")
+
+        if state != whatsapp_web.COMPOSER:
+            # Neither the invalid-number alert nor the composer rendered in time
+            raise TimeoutException("Message box did not render")
+
+        print(f"   📝 Found message box")
+
+        # Click and wait for the composer to take focus
+        with metrics.span("locate_composer"):
+            whatsapp_web.focus_composer(driver, message_box)
+
+        # Put the message into the composer and check it before sending
+        with metrics.span("insert"):
+            whatsapp_web.insert_message(driver, message_box, message)
+
+        # From the keystroke on, a failure must not lead to a second send
+        pressed = False
+        try:
+            with metrics.span("send"):
+                sent_before = whatsapp_web.count_outgoing(driver)
+                pressed = True
+                message_box.send_keys(Keys.ENTER)
+            with metrics.span("confirm"):
+                whatsapp_web.wait_for_outgoing_bubble(driver, sent_before)
+        except Exception as error:
+            if not pressed:
+                raise
+            reason = (str(error).strip().splitlines() or [type(error).__name__])[0][:100]
+            raise SentUnconfirmed(f"Sent but not confirmed: {reason}") from error
+
+        if self.delivery is not None:
+            # Reads the ticks once; delivery resolves in the background
+            self.delivery.track(driver, number)
+        print(f"   ✅ Message sent successfully!\n")
+        return SUCCESS
+
+    def delivery_updates(self, final=False):
+        if self.delivery is None:
+            return []
+        if final:
+            driver = self.supervisor.driver if self.supervisor.is_alive() else None
+            self.delivery.finish(driver, self.delivery_final_wait)
+        return self.delivery.drain()
+
+    def summary(self):
+        supervisor = self.supervisor
+        lines = [f"🧭 Chats opened in-app: {self.route_counts['in_app']}, via URL: {self.route_counts['url']}"]
+        if supervisor.restarts:
+            lines.append(f"🔁 Browser restarts: {supervisor.restarts} ({supervisor.restart_seconds:.0f}s)")
+        if supervisor.failovers:
+            lines.append(f"🔀 Standby failovers: {supervisor.failovers} "
+                         f"(avg {supervisor.failover_seconds / supervisor.failovers:.2f}s)")
+        if supervisor.relogins:
+            lines.append(f"🔐 Logins renewed: {supervisor.relogins}")
+        if supervisor.recycles:
+            lines.append(f"♻️  Memory recycles: {supervisor.recycles} ({supervisor.recycle_seconds:.0f}s)")
+        if self.delivery is not None and self.delivery.counts:
+            lines.append("📬 Delivery: " + ", ".join(f"{status}: {count}"
+                                                  for status, count in sorted(self.delivery.counts.items())))
+        return lines
+
+    def quit(self):
+        self.selector_registry.save()
+        self.supervisor.quit()
@@ -0,0 +1,344 @@
+import re
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+from config import settings
+
+# === Readiness waits ===
+# Each helper blocks on a concrete page condition and returns as soon as it
+# holds, raising TimeoutException only if the page never gets there.
+
+INVALID_NUMBER_XPATH = '//*[contains(text(), "Phone number shared via url is invalid")]'
+OUTGOING_BUBBLE_CSS = '#main div.message-out'
+
+
+def _wait(driver, timeout):
+    return WebDriverWait(driver, timeout, poll_frequency=settings["poll_interval"])
+
+
+LOGIN_STATE_JS = """
+if (document.querySelector('#pane-side, #side')) { return "ready"; }
+if (document.querySelector("div[data-ref] canvas, canvas[aria-label*='Scan']")) { return "qr"; }
+return "loading";
+"""
+
+
+def _login_state(driver):
+    state = driver.execute_script(LOGIN_STATE_JS)
+    return state if state != "loading" else False
+
+
+# WhatsApp Web shell is up (logged in and chat list rendered). Returns as
+# soon as a saved session is recognised ("session"); only if the QR code
+# shows up does it ask for a scan and wait for the login ("qr").
+def wait_for_app(driver, timeout=None, qr_screenshot=None):
+    timeout = timeout or settings["login_timeout"]
+    state = _wait(driver, timeout).until(_login_state)
+    if state == "ready":
+        return "session"
+
+    if qr_screenshot:
+        driver.save_screenshot(qr_screenshot)
+        print(f"🔐 Scan the QR code to log in (saved to '{qr_screenshot}')...")
+    else:
+        print("🔐 Scan the QR code to log in...")
+    _wait(driver, timeout).until(lambda d: d.execute_script(LOGIN_STATE_JS) == "ready")
+    return "qr"
+
+
+# === Chat navigation ===
+# "in_app" opens the chat from the chat list inside the already loaded app,
+# so WhatsApp Web doesn't boot again for every contact. Only existing chats
+# whose title is the number itself are opened this way (saved contacts show
+# a name, which can't be matched safely); anything else falls back to the
+# /send?phone= URL, which reloads the app. A number with no chat yet - the
+# usual case for a bulk send - falls back as soon as the search comes back
+# empty, but still pays for the search, so "url" is the default.
+SEND_URL = "{base}/send?phone={number}"
+SEARCH_BOX_CSS = '#side div[contenteditable="true"]'
+
+# {row, title} for the chat, {row: null} when the list is empty or says
+# nothing was found, null while other chats are still listed
+FIND_CHAT_ROW_JS = """
+var digits = arguments[0];
+var pane = document.querySelector('#pane-side');
+var rows = document.querySelectorAll('#pane-side [role="listitem"], #pane-side [role="row"]');
+for (var i = 0; i < rows.length; i++) {
+    var title = rows[i].querySelector('span[title]');
+    if (title && title.getAttribute('title').replace(/\\D/g, '') === digits) {
+        return {row: rows[i], title: title.getAttribute('title')};
+    }
+}
+if (!rows.length || (pane && /no (chats|results)/i.test(pane.textContent))) {
+    return {row: null, title: null};
+}
+return null;
+"""
+
+CHAT_HEADER_JS = """
+var header = document.querySelector('#main header');
+return !!header && header.textContent.indexOf(arguments[0]) >= 0;
+"""
+
+
+def open_chat_in_app(driver, number, timeout=None):
+    timeout = timeout or settings["in_app_timeout"]
+    digits = re.sub(r"\D", "", number)
+
+    # Already in the rendered chat list: no search needed
+    found = driver.execute_script(FIND_CHAT_ROW_JS, digits)
+    if not (found and found["row"]):
+        search_boxes = driver.find_elements(By.CSS_SELECTOR, SEARCH_BOX_CSS)
+        if not search_boxes:
+            return False
+        search_box = search_boxes[0]
+        search_box.click()
+        search_box.send_keys(Keys.CONTROL + "a", Keys.BACKSPACE)
+        search_box.send_keys(digits)
+
+    try:
+        if not (found and found["row"]):
+            found = _wait(driver, timeout).until(
+                lambda d: d.execute_script(FIND_CHAT_ROW_JS, digits)
+            )
+            if found["row"] is None:
+                return False  # no chat with this number yet
+        found["row"].click()
+        # Don't hand over until the chat pane shows the chat we clicked
+        _wait(driver, timeout).until(
+            lambda d: d.execute_script(CHAT_HEADER_JS, found["title"])
+        )
+    except TimeoutException:
+        return False
+    return True
+
+
+# Returns the route that was used: "in_app" or "url"
+def open_chat(driver, number, mode=None):
+    mode = mode or settings["navigation"]
+    if mode == "in_app":
+        try:
+            if open_chat_in_app(driver, number):
+                return "in_app"
+        except Exception:
+            pass
+    driver.get(SEND_URL.format(base=settings["whatsapp_url"], number=number))
+    return "url"
+
+
+# === Page state probe ===
+# One execute_script call classifies the page after opening /send?phone=...
+# so the loop doesn't have to walk the selectors with a separate wait each.
+INVALID = "invalid"
+COMPOSER = "composer"
+LOADING = "loading"
+LOGGED_OUT = "logged_out"
+
+COMPOSER_SELECTORS = [
+    '//div[@contenteditable="true"][@data-tab="10"]',
+    '//div[@contenteditable="true"][@role="textbox"]',
+    '//div[@title="Type a message"]',
+    '//div[@contenteditable="true"][@data-lexical-editor="true"]',
+    '//p[@class="selectable-text copyable-text"]',
+    '//footer//div[@contenteditable="true"]'
+]
+
+PAGE_STATE_JS = """
+var invalidXpath = arguments[0], selectors = arguments[1];
+function first(xpath) {
+    return document.evaluate(xpath, document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+// First match inside the chat: the chat-list search box comes earlier in
+// the page and matches several of the composer selectors too
+function firstInChat(xpath) {
+    var nodes = document.evaluate(xpath, document, null,
+        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (var n = 0; n < nodes.snapshotLength; n++) {
+        var node = nodes.snapshotItem(n);
+        if (node.closest && node.closest("#main, footer")) {
+            return node;
+        }
+    }
+    return null;
+}
+if (first(invalidXpath)) {
+    return {state: "invalid", element: null, selector: null};
+}
+for (var i = 0; i < selectors.length; i++) {
+    var el = firstInChat(selectors[i]);
+    if (el) {
+        return {state: "composer", element: el, selector: selectors[i]};
+    }
+}
+if (document.querySelector("div[data-ref] canvas, canvas[aria-label*='Scan']")) {
+    return {state: "logged_out", element: null, selector: null};
+}
+return {state: "loading", element: null, selector: null};
+"""
+
+
+# Single round trip: returns (state, element, selector)
+def probe_page(driver, selectors=None):
+    result = driver.execute_script(
+        PAGE_STATE_JS, INVALID_NUMBER_XPATH, selectors or COMPOSER_SELECTORS
+    )
+    return result["state"], result["element"], result["selector"]
+
+
+# Poll the probe until the page leaves the loading state.
+# On timeout the last probe result (normally LOADING) is returned.
+def wait_for_page_state(driver, timeout=None, selectors=None):
+    timeout = timeout or settings["page_timeout"]
+    last = [(LOADING, None, None)]
+
+    def settled(d):
+        last[0] = probe_page(d, selectors)
+        return last[0][0] != LOADING
+
+    try:
+        _wait(driver, timeout).until(settled)
+    except TimeoutException:
+        pass
+    return last[0]
+
+
+# Click the message box and wait until it (or its child paragraph) has focus.
+# A matched paragraph inside the editor counts when the editor has focus.
+def focus_composer(driver, message_box, timeout=None):
+    timeout = timeout or settings["composer_timeout"]
+    message_box.click()
+    _wait(driver, timeout).until(lambda d: d.execute_script(
+        "var a = document.activeElement;"
+        "return a === arguments[0] || arguments[0].contains(a)"
+        " || (a.isContentEditable && a.contains(arguments[0]));",
+        message_box,
+    ))
+
+
+# === Message insertion ===
+# "paste" puts the whole message into the composer with one synthetic paste
+# event (line breaks kept, no per-character keystrokes, emoji safe). "type"
+# is the old line-by-line send_keys. Either way the composer content is
+# checked against the message before ENTER is pressed.
+PASTE_JS = """
+var box = arguments[0], text = arguments[1];
+var target = box.contains(document.activeElement) ? document.activeElement : box;
+var data = new DataTransfer();
+data.setData('text/plain', text);
+target.dispatchEvent(new ClipboardEvent('paste', {
+    clipboardData: data, bubbles: true, cancelable: true
+}));
+"""
+
+# Composer text with emoji images replaced by their alt text and line
+# breaks (<br>, one paragraph per line) turned back into "\n"
+COMPOSER_TEXT_JS = """
+var copy = arguments[0].cloneNode(true);
+copy.querySelectorAll('img[alt]').forEach(function (img) {
+    img.replaceWith(img.getAttribute('alt'));
+});
+copy.querySelectorAll('p, div').forEach(function (block) {
+    // <p><br></p> is an empty line, the <br> only keeps it open
+    if (block.childNodes.length === 1 && block.firstChild.nodeName === 'BR') {
+        block.firstChild.remove();
+    }
+    if (block.previousSibling) {
+        block.before('\\n');
+    }
+});
+copy.querySelectorAll('br').forEach(function (br) {
+    br.replaceWith('\\n');
+});
+return copy.textContent;
+"""
+
+
+# Lines with the whitespace inside each collapsed, and no blank lines at
+# either end - what the editor does to spaces shouldn't fail the check, a
+# missing or extra line break should
+def _lines(text):
+    lines = [re.sub(r"\s+", " ", line).strip() for line in (text or "").split("\n")]
+    while lines and not lines[-1]:
+        lines.pop()
+    while lines and not lines[0]:
+        lines.pop(0)
+    return lines
+
+
+def composer_matches(driver, message_box, message):
+    text = driver.execute_script(COMPOSER_TEXT_JS, message_box)
+    return _lines(text) == _lines(message)
+
+
+# Wait until the composer holds exactly the message, line by line
+def wait_for_composer_message(driver, message_box, message, timeout=None):
+    timeout = timeout or settings["composer_timeout"]
+    _wait(driver, timeout).until(
+        lambda d: composer_matches(d, message_box, message)
+    )
+
+
+def type_message(message_box, message):
+    lines = message.split("\n")
+    for i, line in enumerate(lines):
+        if line.strip():  # Only send non-empty lines
+            message_box.send_keys(line)
+        if i < len(lines) - 1:
+            message_box.send_keys(Keys.SHIFT + Keys.ENTER)
+
+
+def clear_composer(message_box):
+    message_box.send_keys(Keys.CONTROL + "a", Keys.BACKSPACE)
+
+
+# Returns the mode that ended up filling the composer: "paste" or "type"
+def insert_message(driver, message_box, message, mode=None):
+    mode = mode or settings["insert_mode"]
+    # WhatsApp keeps unsent drafts per chat - don't append to one
+    if _lines(driver.execute_script(COMPOSER_TEXT_JS, message_box)):
+        clear_composer(message_box)
+
+    if mode == "paste":
+        driver.execute_script(PASTE_JS, message_box, message)
+        try:
+            wait_for_composer_message(driver, message_box, message,
+                                      timeout=settings["paste_verify_timeout"])
+            return "paste"
+        except TimeoutException:
+            # Paste was ignored or mangled - start over and type it
+            clear_composer(message_box)
+
+    type_message(message_box, message)
+    wait_for_composer_message(driver, message_box, message)
+    return "type"
+
+
+# The saved session ended mid-run (the QR code is showing). Not a failure of
+# the contact: the supervisor waits for a new login and retries it, and if
+# that doesn't happen the run stops.
+class LoggedOut(Exception):
+    pass
+
+
+# Anything that goes wrong once ENTER has been pressed: the message may
+# well be out, so the contact must never be sent again (no supervisor
+# retry, no retry queue) - it is recorded as sent, delivery unconfirmed
+class SentUnconfirmed(Exception):
+    pass
+
+
+def count_outgoing(driver):
+    return len(driver.find_elements(By.CSS_SELECTOR, OUTGOING_BUBBLE_CSS))
+
+
+# Wait for a new outgoing bubble to be appended after pressing ENTER
+def wait_for_outgoing_bubble(driver, previous_count, timeout=None):
+    timeout = timeout or settings["confirm_timeout"]
+    try:
+        _wait(driver, timeout).until(lambda d: count_outgoing(d) > previous_count)
+    except TimeoutException:
+        raise TimeoutException("Sent message did not appear in the chat")